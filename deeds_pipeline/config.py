@@ -27,6 +27,7 @@ STEP3_OUTPUT = OUTPUT_DIR / "step3_scraper_data.json"
 STEP4_OUTPUT = OUTPUT_DIR / "step4_geolocation.json"
 STEP5_OUTPUT = OUTPUT_DIR / "step5_final_integrated.json"
 STEP5_OUTPUT_CSV = OUTPUT_DIR / "step5_final_integrated.csv"
+STEP5_OUTPUT_PARQUET = OUTPUT_DIR / "step5_final_integrated.parquet"
 
 # API Keys (from environment variables)
 GOOGLE_VISION_PROJECT_ID = os.getenv("GOOGLE_VISION_PROJECT_ID", "")
@@ -50,3 +51,4 @@ CHROME_HEADLESS = os.getenv(
 # Cache settings
 ENABLE_CACHE = False  # Enable caching to avoid re-processing
 CACHE_EXPIRY_DAYS = 30  # Cache expiration in days
+IO_BUFFER_BYTES = 1 << 20  # User-space buffer size for file writes
@@ -2,12 +2,15 @@
 Step 2: OCR and Information Extraction
 Extract structured information from deed images using OCR and AI models
 """
+import hashlib
 import io
 import json
 import re
 import requests
+import threading
 import torch
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from typing import Dict, List, Optional, Union
 from pathlib import Path
@@ -18,7 +21,24 @@ from google.cloud import vision
 from google.cloud.vision_v1 import ImageAnnotatorClient
 from google.api_core.client_options import ClientOptions
 
-from .utils import setup_logger, load_json, save_json, get_cache_key, load_from_cache, save_to_cache
+try:
+    # Optional: continuous-batching engine for GPU hosts
+    from vllm import LLM, SamplingParams
+except ImportError:
+    LLM = None
+
+try:
+    # Optional: CPU-side graph/bf16 optimization
+    import intel_extension_for_pytorch as ipex
+except ImportError:
+    ipex = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .utils import setup_logger, load_json, get_cache_key, load_from_cache, save_to_cache
 from .config import STEP1_OUTPUT, STEP2_OUTPUT, ENABLE_CACHE
 
 
@@ -57,26 +77,63 @@ else:
 client = ImageAnnotatorClient(client_options=client_options)
 
 
-# Lazy loading for reglab model (load only when needed to save memory)
+# Lazy loading for reglab model (load only when needed to save memory).
+# The lock makes first-load exclusive: with the deed thread pool, the
+# first batch of workers would otherwise race and load the model once
+# per thread.
 _tokenizer = None
 _model = None
+_model_lock = threading.Lock()
 
 def _load_mistral_model():
-    """Lazy load the Mistral-RRC model only when needed"""
+    """Lazy load the Mistral-RRC model only when needed
+
+    Inference at this size is memory-bound, so the dtype matters more
+    than FLOPs: bf16 on hardware that supports it (same bandwidth win
+    as fp16 with fp32's exponent range), fp16 otherwise.
+    """
     global _tokenizer, _model
-    if _tokenizer is None or _model is None:
-        logger.info("Loading Mistral-RRC model (this may take a few minutes)...")
-        _tokenizer = AutoTokenizer.from_pretrained("reglab-rrc/mistral-rrc")
-        _model = AutoModelForCausalLM.from_pretrained(
-            "reglab-rrc/mistral-rrc",
-            trust_remote_code=True,
-            torch_dtype=torch.float16,  # Use half precision to save memory
-            low_cpu_mem_usage=True      # Optimize for low memory
-        )
-        logger.info("Mistral-RRC model loaded successfully")
+    if _tokenizer is not None and _model is not None:
+        return _tokenizer, _model
+    with _model_lock:
+        if _tokenizer is None or _model is None:
+            logger.info("Loading Mistral-RRC model (this may take a few minutes)...")
+            if torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+                dtype = torch.bfloat16
+            else:
+                dtype = torch.float16
+            _tokenizer = AutoTokenizer.from_pretrained("reglab-rrc/mistral-rrc")
+            _model = AutoModelForCausalLM.from_pretrained(
+                "reglab-rrc/mistral-rrc",
+                trust_remote_code=True,
+                torch_dtype=dtype,          # Half precision to save memory
+                low_cpu_mem_usage=True      # Optimize for low memory
+            )
+            if not torch.cuda.is_available():
+                # CPU path: use every core, and let IPEX fuse/cast to bf16
+                # when installed
+                torch.set_num_threads(os.cpu_count())
+                if ipex is not None:
+                    _model = ipex.optimize(_model, dtype=torch.bfloat16)
+            logger.info("Mistral-RRC model loaded successfully (dtype=%s)", dtype)
     return _tokenizer, _model
 
 
+_vllm_engine = None
+
+def _load_vllm_engine():
+    """Lazy load the Mistral-RRC checkpoint under vLLM"""
+    global _vllm_engine
+    if _vllm_engine is None:
+        with _model_lock:
+            if _vllm_engine is None:
+                logger.info("Loading Mistral-RRC under vLLM (continuous batching)...")
+                _vllm_engine = LLM(model="reglab-rrc/mistral-rrc",
+                                   dtype="bfloat16",
+                                   gpu_memory_utilization=0.85)
+    return _vllm_engine
+
+
 def extract_plan_references_regex(text: str) -> Dict[str, Optional[List[str]]]:
     """
     Regex fallback for extracting plan book/page when LLM fails.
@@ -145,6 +202,17 @@ def extract_text_with_google_vision(image_url: str) -> Optional[str]:
         image_bytes = requests.get(image_url).content
         image = Image.open(io.BytesIO(image_bytes))
 
+        # Content-hash cache: identical images recur across deeds
+        # (reused PDF pages, boilerplate headers), and keying by image
+        # bytes rather than deed_id lets them share one Vision call
+        if ENABLE_CACHE:
+            content_key = get_cache_key(
+                "step2_img", hashlib.sha1(image_bytes).hexdigest())
+            cached = load_from_cache(content_key)
+            if cached and cached.get("ocr_text"):
+                logger.info("✅ OCR loaded from content-hash cache")
+                return cached["ocr_text"]
+
         # OCR
         logger.info("\n2️⃣ Performing OCR using Google Vision API")
         vision_image = vision.Image(content=image_bytes)
@@ -174,6 +242,9 @@ def extract_text_with_google_vision(image_url: str) -> Optional[str]:
         else:
             logger.info(f"⚠️  No racial restriction keywords found")
 
+        if ENABLE_CACHE:
+            save_to_cache(content_key, {"ocr_text": full_text})
+
         return full_text
 
     except Exception as e:
@@ -183,6 +254,33 @@ def extract_text_with_google_vision(image_url: str) -> Optional[str]:
     
 
 
+def _parse_covenant_output(output: str) -> Dict[str, any]:
+    """Parse the tagged Mistral-RRC response into fields"""
+    answer_match = re.search(r"\[ANSWER\](.*?)\[/ANSWER\]", output, re.DOTALL)
+    raw_passage_match = re.search(r"\[RAW PASSAGE\](.*?)\[/RAW PASSAGE\]", output, re.DOTALL)
+    quotation_match = re.search(r"\[CORRECTED QUOTATION\](.*?)\[/CORRECTED QUOTATION\]", output, re.DOTALL)
+
+    answer = answer_match.group(1).strip() if answer_match else None
+    raw_passage = raw_passage_match.group(1).strip() if raw_passage_match else None
+    quotation = quotation_match.group(1).strip() if quotation_match else None
+
+    return {
+        "answer": answer == "Yes",
+        "raw_passage": raw_passage,
+        "quotation": quotation
+    }
+
+
+def _format_covenant_prompt(document: str) -> str:
+    return f"""### Instruction:
+        Determine whether the property deed contains a racial covenant. A racial covenant is a clause in a document that restricts who can reside, own, or occupy a property on the basis of race, ethnicity, national origin, or religion. Answer "Yes" or "No". If "Yes", provide the exact text of the relevant passage and then a quotation of the passage with spelling and formatting errors fixed.
+
+        ### Input:
+        {document}
+
+        ### Response:"""
+
+
 def detect_restrictive_covenant(text: str) -> Dict[str, any]:
     """
     Detect restrictive covenant using Mistral-RRC model
@@ -198,56 +296,78 @@ def detect_restrictive_covenant(text: str) -> Dict[str, any]:
             "corrected_quotation": str
         }
     """
+    logger.debug(f"Detecting restrictive covenant in text (length: {len(text)})")
+    return detect_restrictive_covenants_batch([text])[0]
 
-    def parse_output(output):
-        answer_match = re.search(r"\[ANSWER\](.*?)\[/ANSWER\]", output, re.DOTALL)
-        raw_passage_match = re.search(r"\[RAW PASSAGE\](.*?)\[/RAW PASSAGE\]", output, re.DOTALL)
-        quotation_match = re.search(r"\[CORRECTED QUOTATION\](.*?)\[/CORRECTED QUOTATION\]", output, re.DOTALL)
-
-        answer = answer_match.group(1).strip() if answer_match else None
-        raw_passage = raw_passage_match.group(1).strip() if raw_passage_match else None
-        quotation = quotation_match.group(1).strip() if quotation_match else None
 
-        return {
-            "answer": answer == "Yes",
-            "raw_passage": raw_passage,
-            "quotation": quotation
-        }
+def detect_restrictive_covenants_batch(texts: List[str],
+                                       batch_size: int = 8) -> List[Dict]:
+    """
+    Detect restrictive covenants for many texts in batched forward passes
     
-    def format_prompt(document):
-        return f"""### Instruction:
-        Determine whether the property deed contains a racial covenant. A racial covenant is a clause in a document that restricts who can reside, own, or occupy a property on the basis of race, ethnicity, national origin, or religion. Answer "Yes" or "No". If "Yes", provide the exact text of the relevant passage and then a quotation of the passage with spelling and formatting errors fixed.
-
-        ### Input:
-        {document}
-
-        ### Response:"""
-
-
-    logger.debug(f"Detecting restrictive covenant in text (length: {len(text)})")
+    One generate() call over a padded batch costs close to a single
+    sample on GPU and 2-4x less than per-sample calls on CPU.
+    
+    Args:
+        texts: OCR extracted texts
+        batch_size: Number of prompts per forward pass
+    
+    Returns:
+        One detection result dict per input text, in order
+    """
+    # vLLM path: the engine packs prompts into shared forward passes
+    # (continuous batching) and keeps the KV cache warm — typically
+    # 5-20x the padded-batch throughput on GPU
+    if LLM is not None and torch.cuda.is_available():
+        engine = _load_vllm_engine()
+        outputs = engine.generate(
+            [_format_covenant_prompt(t) for t in texts],
+            SamplingParams(max_tokens=512, temperature=0.1))
+        results = []
+        for output in outputs:
+            parsed_result = _parse_covenant_output(output.outputs[0].text)
+            results.append({
+                "covenant_detected": parsed_result["answer"],
+                "raw_passage": parsed_result.get("raw_passage", "N/A"),
+                "corrected_quotation": parsed_result.get("quotation", "N/A"),
+            })
+        return results
 
     # Lazy load model
     tokenizer, model = _load_mistral_model()
-
-    prompt = format_prompt(text)
-    inputs = tokenizer(prompt, return_tensors="pt")
-
-    if torch.cuda.is_available():
-        inputs = {k: v.cuda() for k, v in inputs.items()}
-        if not next(model.parameters()).is_cuda:
-            model.cuda()
-
-    with torch.no_grad():
-        outputs = model.generate(**inputs, max_new_tokens=512, temperature=0.1)
-
-    result_text = tokenizer.decode(outputs[0])
-    parsed_result = parse_output(result_text)
-
-    return {
-        "covenant_detected": parsed_result["answer"],
-        "raw_passage": parsed_result.get("raw_passage", "N/A"),
-        "corrected_quotation": parsed_result.get("quotation", "N/A"),
-    }
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    # Decoder-only models must pad on the left: with right padding
+    # every shorter prompt in the batch would be conditioned on
+    # trailing pad tokens during generate()
+    tokenizer.padding_side = "left"
+
+    use_cuda = torch.cuda.is_available()
+    if use_cuda and not next(model.parameters()).is_cuda:
+        model.cuda()
+
+    results = []
+    for start in range(0, len(texts), batch_size):
+        prompts = [_format_covenant_prompt(t)
+                   for t in texts[start:start + batch_size]]
+        inputs = tokenizer(prompts, return_tensors="pt",
+                           padding=True, truncation=True)
+        if use_cuda:
+            inputs = {k: v.cuda() for k, v in inputs.items()}
+
+        with torch.no_grad():
+            outputs = model.generate(**inputs, max_new_tokens=512,
+                                     temperature=0.1)
+
+        for row in outputs:
+            parsed_result = _parse_covenant_output(
+                tokenizer.decode(row, skip_special_tokens=True))
+            results.append({
+                "covenant_detected": parsed_result["answer"],
+                "raw_passage": parsed_result.get("raw_passage", "N/A"),
+                "corrected_quotation": parsed_result.get("quotation", "N/A"),
+            })
+    return results
 
 
 def extract_deed_info_with_gemini(ocr_text: str) -> Dict[str, Optional[List[str]]]:
@@ -400,15 +520,59 @@ def process_deed_images(deed_record: Dict) -> Dict:
     return deed_record
 
 
-def process_deeds_ocr(deed_data: Dict[str, Dict]) -> Dict[str, Dict]:
+def _dump_jsonl_line(record: Dict) -> bytes:
+    """Serialize one deed result as a JSON line"""
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, ensure_ascii=True) + "\n").encode()
+
+
+def _save_results_streaming(processed_data: Dict[str, Dict],
+                            output_file: Path) -> None:
+    """Write the output dict one deed at a time.
+
+    Serializing the whole dict in one dumps() call allocates a second
+    full-dataset byte string before anything hits disk; emitting the
+    object key by key keeps the transient allocation at one deed.
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_file.with_name(output_file.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(b'{')
+        first = True
+        for deed_id, record in processed_data.items():
+            if not first:
+                f.write(b',')
+            if orjson is not None:
+                f.write(orjson.dumps(str(deed_id)) + b':' + orjson.dumps(record))
+            else:
+                f.write((json.dumps(str(deed_id)) + ':'
+                         + json.dumps(record, ensure_ascii=True)).encode())
+            first = False
+        f.write(b'}')
+    os.replace(tmp_path, output_file)
+
+
+def process_deeds_ocr(deed_data: Dict[str, Dict],
+                      max_workers: Optional[int] = None,
+                      jsonl_file: Optional[Path] = None) -> Dict[str, Dict]:
     """
     FUNCTION-BASED INTERFACE for notebook integration.
     Process deed records with OCR and information extraction.
 
+    Deeds are independent, so they are processed concurrently: the
+    per-deed cost is dominated by Vision/Gemini API round-trips, which
+    overlap cleanly in a thread pool.
+
     Args:
         deed_data: Dictionary of deed records indexed by deed_id
             Format: {deed_id: {deed_record}, ...}
             Each deed_record must have 'image_urls' field
+        max_workers: Concurrent deeds (default: cpu_count, capped at 8)
+        jsonl_file: Optional path for an append-only JSONL checkpoint;
+            each deed is written (and flushed) as soon as it completes,
+            so a crash mid-run loses at most the in-flight deeds
 
     Returns:
         Same dictionary with each record augmented with:
@@ -419,19 +583,44 @@ def process_deeds_ocr(deed_data: Dict[str, Dict]) -> Dict[str, Dict]:
     """
     logger.info(f"Starting Step 2 processing for {len(deed_data)} deed(s)")
 
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 4)
+
     processed_data = {}
     total = len(deed_data)
 
-    for idx, (deed_id, deed_record) in enumerate(deed_data.items(), 1):
-        logger.info(f"Processing deed {deed_id} ({idx}/{total})")
-        try:
-            processed_data[deed_id] = process_deed_images(deed_record)
-        except Exception as e:
-            logger.error(f"Error processing deed {deed_id}: {e}", exc_info=True)
-            # Keep original record with error flag
-            deed_record["step2_error"] = str(e)
-            deed_record["step2_completed"] = False
-            processed_data[deed_id] = deed_record
+    jsonl_handle = None
+    if jsonl_file is not None:
+        jsonl_file.parent.mkdir(parents=True, exist_ok=True)
+        jsonl_handle = open(jsonl_file, 'ab')
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(process_deed_images, deed_record): deed_id
+                       for deed_id, deed_record in deed_data.items()}
+            for idx, future in enumerate(as_completed(futures), 1):
+                deed_id = futures[future]
+                try:
+                    processed_data[deed_id] = future.result()
+                    logger.info(f"Completed deed {deed_id} ({idx}/{total})")
+                except Exception as e:
+                    logger.error(f"Error processing deed {deed_id}: {e}", exc_info=True)
+                    # Keep original record with error flag
+                    deed_record = deed_data[deed_id]
+                    deed_record["step2_error"] = str(e)
+                    deed_record["step2_completed"] = False
+                    processed_data[deed_id] = deed_record
+                if jsonl_handle is not None:
+                    jsonl_handle.write(_dump_jsonl_line(
+                        {deed_id: processed_data[deed_id]}))
+                    jsonl_handle.flush()
+    finally:
+        if jsonl_handle is not None:
+            jsonl_handle.close()
+
+    # Restore input ordering (as_completed yields in finish order)
+    processed_data = {deed_id: processed_data[deed_id]
+                      for deed_id in deed_data if deed_id in processed_data}
 
     logger.info(f"Step 2 completed for {len(processed_data)} deed(s)")
     return processed_data
@@ -506,14 +695,17 @@ def run_step2(
             f"input_data must be Path, str, dict, or None, got {type(input_data)}"
         )
 
-    # Process deeds
+    # Process deeds, checkpointing each completed deed to a JSONL log
+    # next to the output so a crash doesn't lose hours of OCR
     try:
-        processed_data = process_deeds_ocr(deed_data)
+        jsonl_file = (Path(output_file).with_suffix('.jsonl')
+                      if output_file is not None else None)
+        processed_data = process_deeds_ocr(deed_data, jsonl_file=jsonl_file)
 
         # Save to file if output_file is specified
         if output_file is not None:
             logger.info(f"Saving processed data to {output_file}...")
-            save_json(processed_data, output_file)
+            _save_results_streaming(processed_data, output_file)
             logger.info(f"Step 2 completed. Output saved to {output_file}")
         else:
             logger.info(f"Step 2 completed (no file output)")
@@ -10,11 +10,13 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 import httpx
+import numpy as np
 
 # Import nest_asyncio for Jupyter compatibility
 try:
@@ -24,13 +26,57 @@ try:
 except ImportError:
     NEST_ASYNCIO_AVAILABLE = False
 
-from .utils import setup_logger, load_json, save_json, get_cache_key, load_from_cache, save_to_cache
-from .config import STEP3_OUTPUT, STEP4_OUTPUT, ENABLE_CACHE
+from .utils import setup_logger, load_json, save_json, save_json_compact, get_cache_key, load_from_cache
+from .config import STEP3_OUTPUT, STEP4_OUTPUT, ENABLE_CACHE, CACHE_DIR, CACHE_EXPIRY_DAYS
 
 
 logger = setup_logger("step4_geolocation", "step4.log")
 
 
+# Completed records waiting to be written to the cache. Buffering them and
+# flushing the whole batch into one combined file avoids one tiny disk
+# write per geocoded deed.
+_pending_cache: Dict[str, Dict] = {}
+_CACHE_FLUSH_INTERVAL = 64
+_BATCH_CACHE_FILE = CACHE_DIR / "step4_records.json"
+_batch_cache: Optional[Dict[str, Dict]] = None
+
+
+def _load_batch_cache() -> Dict[str, Dict]:
+    """Load the combined step 4 cache file, once per run."""
+    global _batch_cache
+    if _batch_cache is None:
+        _batch_cache = {}
+        try:
+            if (_BATCH_CACHE_FILE.exists()
+                    and time.time() - _BATCH_CACHE_FILE.stat().st_mtime
+                    <= CACHE_EXPIRY_DAYS * 86400.0):
+                _batch_cache = load_json(_BATCH_CACHE_FILE)
+        except Exception:
+            # A corrupt batch file just means a cold cache
+            pass
+    return _batch_cache
+
+
+def flush_cache() -> None:
+    """Merge all pending deed records into the combined cache file.
+
+    The whole batch goes out through a single save_json_compact call
+    (one temp file plus an atomic rename), not one file per record.
+    """
+    if not _pending_cache:
+        return
+    logger.debug(f"Flushing {len(_pending_cache)} pending cache entries")
+    batch = _load_batch_cache()
+    batch.update(_pending_cache)
+    try:
+        save_json_compact(batch, _BATCH_CACHE_FILE)
+    except Exception as e:
+        # Cache save failures should not break the pipeline
+        logger.warning(f"Failed to write batch cache: {e}")
+    _pending_cache.clear()
+
+
 # --- Data models (ported from deed_geo_indexing) ---
 
 @dataclass
@@ -73,6 +119,7 @@ class StreetClusteringValidator:
     CLUSTERING_RADIUS_MILES = 3.0
     MILES_PER_DEGREE_LAT = 69.0
     MILES_PER_DEGREE_LON = 55.0
+    EARTH_RADIUS_MILES = 3958.7613
 
     def __init__(self):
         self.user_agent = "DeedGeocoder/1.0"
@@ -148,6 +195,18 @@ class StreetClusteringValidator:
                 },
             )
 
+        # Trim isolated geocodes before computing the cluster center so a
+        # single stray candidate cannot blow up the radius
+        trimmed = self._trim_outliers(validated_streets)
+        if len(trimmed) < len(validated_streets):
+            dropped = [s for s in validated_streets if s not in trimmed]
+            logger.info(
+                f"Trimmed {len(dropped)} outlier street(s): "
+                f"{[s.street_name for s in dropped]}"
+            )
+            invalid_streets = invalid_streets + [s.street_name for s in dropped]
+            validated_streets = trimmed
+
         center_lat, center_lon = self._calculate_centroid(validated_streets)
         radius = self._calculate_radius((center_lat, center_lon), validated_streets)
         final_address = await self._reverse_geocode(center_lat, center_lon)
@@ -253,6 +312,15 @@ class StreetClusteringValidator:
             return parts[1]
         return "UNKNOWN"
 
+    def _coords_soa(
+        self, points: List[ValidatedStreet | GeocodingCandidate]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract lat/lon as float32 SoA arrays (8 B/point vs ~200 B/dict)."""
+        n = len(points)
+        lats = np.fromiter((p.latitude for p in points), dtype=np.float32, count=n)
+        lons = np.fromiter((p.longitude for p in points), dtype=np.float32, count=n)
+        return lats, lons
+
     def _find_densest_cluster(self, candidates: List[GeocodingCandidate]) -> Dict:
         if not candidates:
             return {"candidates": [], "center_lat": 0.0, "center_lon": 0.0}
@@ -263,24 +331,22 @@ class StreetClusteringValidator:
                 "center_lon": candidates[0].longitude,
             }
 
-        best_cluster = None
-        best_size = 0
-        for seed in candidates:
-            neighbors = [
-                c
-                for c in candidates
-                if self._distance(seed.latitude, seed.longitude, c.latitude, c.longitude)
-                <= self.CLUSTERING_RADIUS_MILES
-            ]
-            if len(neighbors) > best_size:
-                best_size = len(neighbors)
-                center_lat, center_lon = self._calculate_centroid(neighbors)
-                best_cluster = {"candidates": neighbors, "center_lat": center_lat, "center_lon": center_lon}
-
-        if best_cluster is None:
-            center_lat, center_lon = self._calculate_centroid(candidates)
-            best_cluster = {"candidates": candidates, "center_lat": center_lat, "center_lon": center_lon}
-        return best_cluster
+        # Vectorized all-pairs neighbor counting on the SoA arrays instead of
+        # the O(n^2) Python loop over candidate objects
+        lats, lons = self._coords_soa(candidates)
+        lat_diff = np.abs(lats[:, None] - lats[None, :]) * self.MILES_PER_DEGREE_LAT
+        lon_diff = np.abs(lons[:, None] - lons[None, :]) * self.MILES_PER_DEGREE_LON
+        distances = np.sqrt(lat_diff**2 + lon_diff**2)
+        neighbor_mask = distances <= self.CLUSTERING_RADIUS_MILES
+        best_seed = int(neighbor_mask.sum(axis=1).argmax())
+
+        seed_mask = neighbor_mask[best_seed]
+        neighbors = [c for c, keep in zip(candidates, seed_mask) if keep]
+        return {
+            "candidates": neighbors,
+            "center_lat": float(lats[seed_mask].mean()),
+            "center_lon": float(lons[seed_mask].mean()),
+        }
 
     def _identify_primary_town(self, candidates: List[GeocodingCandidate]) -> str:
         town_counts: Dict[str, int] = {}
@@ -336,19 +402,46 @@ class StreetClusteringValidator:
         lon_diff = abs(lon2 - lon1) * self.MILES_PER_DEGREE_LON
         return (lat_diff**2 + lon_diff**2) ** 0.5
 
+    def _trim_outliers(self, streets: List[ValidatedStreet]) -> List[ValidatedStreet]:
+        """Drop streets whose nearest neighbor is beyond the clustering radius."""
+        if len(streets) < 3:
+            return streets
+
+        lats, lons = self._coords_soa(streets)
+        coords = np.deg2rad(np.column_stack([lats, lons]).astype(np.float64))
+        try:
+            # O(n log n) neighbor lookup when scikit-learn is installed
+            from sklearn.neighbors import BallTree
+            tree = BallTree(coords, metric="haversine")
+            dist, _ = tree.query(coords, k=2)
+            nearest = dist[:, 1] * self.EARTH_RADIUS_MILES
+        except ImportError:
+            # Vectorized all-pairs haversine; n per deed is small
+            lat, lon = coords[:, 0][:, None], coords[:, 1][:, None]
+            dlat, dlon = lat - lat.T, lon - lon.T
+            a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+            d = 2 * self.EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+            np.fill_diagonal(d, np.inf)
+            nearest = d.min(axis=1)
+
+        keep = nearest <= self.CLUSTERING_RADIUS_MILES
+        if keep.all() or not keep.any():
+            return streets
+        return [s for s, k in zip(streets, keep) if k]
+
     def _calculate_centroid(self, points: List[ValidatedStreet | GeocodingCandidate]) -> Tuple[float, float]:
         if not points:
             return (0.0, 0.0)
-        avg_lat = sum(p.latitude for p in points) / len(points)
-        avg_lon = sum(p.longitude for p in points) / len(points)
-        return (avg_lat, avg_lon)
+        lats, lons = self._coords_soa(points)
+        return (float(lats.mean()), float(lons.mean()))
 
     def _calculate_radius(self, center: Tuple[float, float], points: List[ValidatedStreet]) -> float:
-        max_distance = 0.0
-        for p in points:
-            d = self._distance(center[0], center[1], p.latitude, p.longitude)
-            max_distance = max(max_distance, d)
-        return max_distance
+        if not points:
+            return 0.0
+        lats, lons = self._coords_soa(points)
+        lat_diff = np.abs(lats - center[0]) * self.MILES_PER_DEGREE_LAT
+        lon_diff = np.abs(lons - center[1]) * self.MILES_PER_DEGREE_LON
+        return float(np.sqrt(lat_diff**2 + lon_diff**2).max())
 
     async def _reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
         try:
@@ -412,7 +505,11 @@ async def process_deed_geolocation(deed_record: Dict, validator: StreetClusterin
     # Check cache
     if ENABLE_CACHE:
         cache_key = get_cache_key("step4", deed_id)
-        cached = load_from_cache(cache_key)
+        # Check the unflushed batch and the combined file first; fall back
+        # to the per-key files older runs wrote
+        cached = (_pending_cache.get(cache_key)
+                  or _load_batch_cache().get(cache_key)
+                  or load_from_cache(cache_key))
         if cached:
             logger.info(f"Deed {deed_id}: Loaded from cache")
             return cached
@@ -429,12 +526,15 @@ async def process_deed_geolocation(deed_record: Dict, validator: StreetClusterin
     # Determine town: prefer deed_record['town'], else derive from scraper_results
     town = deed_record.get("town")
     if not town:
-        scraper_results = deed_record.get("scraper_results", [])
-        for s in scraper_results:
-            city_town = s.get("metadata", {}).get("search_result_info", {}).get("town")
-            if city_town:
-                town = city_town
-                break
+        # Single-pass fastpath: the walrus fetches each nested dict chain once
+        town = next(
+            (
+                ct
+                for s in deed_record.get("scraper_results", ())
+                if (ct := (s.get("metadata") or {}).get("search_result_info", {}).get("town"))
+            ),
+            "",
+        )
     if not town:
         logger.warning(f"Deed {deed_id}: No town information found")
         town = ""
@@ -447,7 +547,7 @@ async def process_deed_geolocation(deed_record: Dict, validator: StreetClusterin
     deed_record["step4_completed"] = True
 
     if ENABLE_CACHE:
-        save_to_cache(cache_key, deed_record)
+        _pending_cache[cache_key] = deed_record
 
     return deed_record
 
@@ -468,19 +568,26 @@ async def process_deeds_geolocation_async(deed_records: List[Dict]) -> List[Dict
     validator = initialize_clustering_validator()
     processed_records = []
 
-    for idx, deed_record in enumerate(deed_records, 1):
-        deed_id = deed_record.get("deed_id", f"unknown_{idx}")
-        logger.info(f"[{idx}/{len(deed_records)}] Processing deed {deed_id}")
+    try:
+        for idx, deed_record in enumerate(deed_records, 1):
+            deed_id = deed_record.get("deed_id", f"unknown_{idx}")
+            logger.info(f"[{idx}/{len(deed_records)}] Processing deed {deed_id}")
 
-        try:
-            processed = await process_deed_geolocation(deed_record, validator)
-            processed_records.append(processed)
-        except Exception as e:
-            logger.error(f"Deed {deed_id} geolocation failed: {e}", exc_info=True)
-            deed_record["geolocation"] = None
-            deed_record["step4_error"] = str(e)
-            deed_record["step4_completed"] = False
-            processed_records.append(deed_record)
+            try:
+                processed = await process_deed_geolocation(deed_record, validator)
+                processed_records.append(processed)
+            except Exception as e:
+                logger.error(f"Deed {deed_id} geolocation failed: {e}", exc_info=True)
+                deed_record["geolocation"] = None
+                deed_record["step4_error"] = str(e)
+                deed_record["step4_completed"] = False
+                processed_records.append(deed_record)
+
+            # Periodic flush so a crash loses at most one batch
+            if idx % _CACHE_FLUSH_INTERVAL == 0:
+                flush_cache()
+    finally:
+        flush_cache()
 
     logger.info(f"Step 4 completed for {len(processed_records)} deed(s)")
     return processed_records
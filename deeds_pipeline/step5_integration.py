@@ -5,16 +5,38 @@ Consolidate all processing results into final dataset
 Function-based interface for notebook integration.
 """
 
+import csv
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 from .utils import setup_logger, load_json, save_json
-from .config import STEP4_OUTPUT, STEP5_OUTPUT, STEP5_OUTPUT_CSV
+from .config import (STEP4_OUTPUT, STEP5_OUTPUT, STEP5_OUTPUT_CSV,
+                     STEP5_OUTPUT_PARQUET, IO_BUFFER_BYTES)
 
 
 logger = setup_logger("step5_integration", "step5.log")
 
+_BAR = "=" * 60
+
 
 def _ensure_list(value: Any) -> List:
     """Normalize value to list (empty when None)."""
@@ -36,24 +58,27 @@ def _merge_unique_lists(a: Any, b: Any) -> List:
     return merged
 
 
+def _geo_score(geo: Dict) -> Tuple[int, int, float]:
+    """Rank a geolocation result by richness (center, streets, confidence)."""
+    if not geo:
+        return (0, 0, 0.0)
+    has_center = int(
+        geo.get("cluster_center_lat") is not None and geo.get(
+            "cluster_center_lon") is not None
+    )
+    validated = len(geo.get("validated_streets", [])) if isinstance(
+        geo.get("validated_streets"), list) else 0
+    confidence = geo.get("confidence") or 0.0
+    return has_center, validated, float(confidence)
+
+
 def _select_best_geolocation(current: Dict, candidate: Dict) -> Dict:
     """Choose the richer geolocation result."""
     if not candidate:
         return current
     if not current:
         return candidate
-
-    def score(geo: Dict) -> Tuple[int, int, float]:
-        has_center = int(
-            geo.get("cluster_center_lat") is not None and geo.get(
-                "cluster_center_lon") is not None
-        )
-        validated = len(geo.get("validated_streets", [])) if isinstance(
-            geo.get("validated_streets"), list) else 0
-        confidence = geo.get("confidence") or 0.0
-        return has_center, validated, float(confidence)
-
-    return candidate if score(candidate) > score(current) else current
+    return max((current, candidate), key=_geo_score)
 
 
 def deduplicate_deed_records(deed_records: List[Dict]) -> List[Dict]:
@@ -64,6 +89,7 @@ def deduplicate_deed_records(deed_records: List[Dict]) -> List[Dict]:
     available data across duplicates.
     """
     merged: Dict[str, Dict] = {}
+    copied: set = set()
     duplicate_count = 0
 
     list_fields = [
@@ -93,7 +119,7 @@ def deduplicate_deed_records(deed_records: List[Dict]) -> List[Dict]:
 
     for record in deed_records:
         if not isinstance(record, dict):
-            logger.warning(f"Skipping non-dict record during deduplication: {record}")
+            logger.warning("Skipping non-dict record during deduplication: %s", record)
             continue
 
         deed_id = str(record.get("deed_id", "")).strip()
@@ -102,11 +128,16 @@ def deduplicate_deed_records(deed_records: List[Dict]) -> List[Dict]:
             continue
 
         if deed_id not in merged:
-            merged[deed_id] = record.copy()
+            # Defer the copy: single-occurrence deeds (the common case)
+            # are never mutated, so they don't need one
+            merged[deed_id] = record
             continue
 
         duplicate_count += 1
         base = merged[deed_id]
+        if deed_id not in copied:
+            base = merged[deed_id] = base.copy()
+            copied.add(deed_id)
 
         # Prefer filled scalar values
         for field in scalar_fields:
@@ -132,137 +163,280 @@ def deduplicate_deed_records(deed_records: List[Dict]) -> List[Dict]:
 
     if duplicate_count:
         logger.info(
-            f"Deduplicated {duplicate_count} duplicate record(s); {len(merged)} unique deed_id(s) remain")
+            "Deduplicated %d duplicate record(s); %d unique deed_id(s) remain",
+            duplicate_count, len(merged))
 
     return list(merged.values())
 
 
-def flatten_deed_record(deed_id: str, deed_record: Dict) -> Dict[str, Any]:
-    """
-    Flatten nested deed record into a single-level dictionary
+# Flat-column name -> extracted_info key for the OCR-aggregated columns
+_OCR_LIST_COLUMNS = {
+    "plan_books": "plan_book",
+    "plan_pages": "plan_pages",
+    "lot_numbers": "lot_numbers",
+    "extracted_streets": "street_addresses",
+    "extracted_towns": "city_town",
+}
 
-    Args:
-        deed_id: Deed ID
-        deed_record: Nested deed record from Step 4
 
-    Returns:
-        Flattened dictionary suitable for CSV/DataFrame
-    """
-    flat = {
-        "deed_id": deed_id,
-        "review_ids": ",".join(map(str, deed_record.get("review_ids", []))),
-        "city": deed_record.get("city"),
-        "deed_date": deed_record.get("deed_date"),
-        "address": deed_record.get("address"),
-        "is_restrictive_covenant": deed_record.get("is_restrictive_covenant"),
-        "county": deed_record.get("county"),
-    }
+# Shared empty-dict sentinel so `or _EMPTY` fallbacks don't allocate
+_EMPTY: Dict = {}
 
-    # Add grantor/grantee info (flatten lists to strings)
-    grantors = deed_record.get("grantors", [])
-    grantees = deed_record.get("grantees", [])
-    flat["grantors"] = "; ".join(grantors) if isinstance(
-        grantors, list) else grantors
-    flat["grantees"] = "; ".join(grantees) if isinstance(
-        grantees, list) else grantees
 
-    # Add covenant information
-    exact_covenants = deed_record.get("exact_language_covenants", [])
-    if exact_covenants:
-        flat["covenant_text"] = exact_covenants[0] if isinstance(
-            exact_covenants, list) else exact_covenants
-    else:
-        flat["covenant_text"] = None
-
-    # Add OCR detected covenant from Step 2
-    ocr_covenant_detected = False
-    ocr_covenant_text = None
-    ocr_results = deed_record.get("ocr_results", [])
-    if ocr_results:
-        for result in ocr_results:
-            covenant_detection = result.get("covenant_detection", {})
-            if covenant_detection.get("covenant_detected"):
-                ocr_covenant_detected = True
-                ocr_covenant_text = covenant_detection.get(
-                    "corrected_quotation")
-                break
-
-    flat["ocr_covenant_detected"] = ocr_covenant_detected
-    flat["ocr_covenant_text"] = ocr_covenant_text
+def _join_unique(xs) -> Any:
+    """Order-preserving '; '-join of unique values (None when empty)."""
+    if not xs:
+        return None
+    return "; ".join(dict.fromkeys(str(x) for x in xs))
 
-    # Add extracted information from Step 2 (Gemini)
-    plan_books = []
-    plan_pages = []
-    lot_numbers = []
-    street_addresses = []
-    city_towns: List[str] = []
 
+def _scan_ocr_results(
+        ocr_results: List[Dict]) -> Tuple[bool, Any, Dict[str, List]]:
+    """
+    One pass over a deed's OCR results: the Step-2 covenant flag/text
+    plus the raw extracted_info lists for the aggregated columns.
+    """
+    covenant_detected = False
+    covenant_text = None
+    collected: Dict[str, List] = {col: [] for col in _OCR_LIST_COLUMNS}
     for result in ocr_results:
-        extracted_info = result.get("extracted_info", {})
-        if extracted_info.get("plan_book"):
-            plan_books.extend(_ensure_list(extracted_info["plan_book"]))
-        if extracted_info.get("plan_pages"):
-            plan_pages.extend(_ensure_list(extracted_info["plan_pages"]))
-        if extracted_info.get("lot_numbers"):
-            lot_numbers.extend(_ensure_list(extracted_info["lot_numbers"]))
-        if extracted_info.get("street_addresses"):
-            street_addresses.extend(_ensure_list(extracted_info["street_addresses"]))
-        if extracted_info.get("city_town"):
-            city_towns.extend(_ensure_list(extracted_info["city_town"]))
-
-    flat["plan_books"] = "; ".join(sorted(set(str(x) for x in plan_books))) if plan_books else None
-    flat["plan_pages"] = "; ".join(sorted(set(str(x) for x in plan_pages))) if plan_pages else None
-    flat["lot_numbers"] = "; ".join(sorted(set(str(x) for x in lot_numbers))) if lot_numbers else None
-    flat["extracted_streets"] = "; ".join(sorted(set(str(x) for x in street_addresses))) if street_addresses else None
-    # Deduplicate towns while ignoring nested lists
+        result_get = result.get
+        cd = result_get("covenant_detection") or _EMPTY
+        if not covenant_detected and cd.get("covenant_detected"):
+            covenant_detected = True
+            covenant_text = cd.get("corrected_quotation")
+        ei = result_get("extracted_info") or _EMPTY
+        for col, key in _OCR_LIST_COLUMNS.items():
+            value = ei.get(key)
+            if value:
+                collected[col].extend(_ensure_list(value))
+
+    # Towns may contain nested lists; flatten and drop empties
     towns_norm: List[str] = []
-    for t in city_towns:
+    for t in collected["extracted_towns"]:
         if isinstance(t, list):
             towns_norm.extend([x for x in t if x])
         elif t:
             towns_norm.append(t)
-    flat["extracted_towns"] = "; ".join(
-        sorted(set(towns_norm))) if towns_norm else None
-
-    # Add scraped streets from Step 3
-    scraped_streets = deed_record.get("extracted_streets", [])
-    flat["scraped_streets"] = "; ".join(
-        scraped_streets) if scraped_streets else None
-    flat["scraped_street_count"] = len(
-        scraped_streets) if scraped_streets else 0
-
-    # Add geolocation from Step 4
-    geolocation = deed_record.get("geolocation")
+    collected["extracted_towns"] = towns_norm
+
+    return covenant_detected, covenant_text, collected
+
+
+def _aggregate_ocr_columns(df: pd.DataFrame, ocr_lists: List[Dict[str, List]]) -> None:
+    """
+    Fill the OCR-aggregated string columns on the flattened frame using
+    pandas explode/dedup/join instead of per-record Python loops.
+
+    Values keep their first-seen order within each deed — the same
+    ordering _join_unique produces — so the Parquet and CSV outputs of
+    one run agree cell for cell.
+    """
+    raw = pd.DataFrame(ocr_lists)
+    for col in _OCR_LIST_COLUMNS:
+        # explode preserves list order per row and drop_duplicates keeps
+        # first occurrences, so no sort is needed (or wanted)
+        exploded = raw[col].explode().dropna().astype(str).reset_index()
+        exploded = exploded.drop_duplicates()
+        joined = exploded.groupby("index")[col].agg("; ".join)
+        df[col] = joined.reindex(df.index)
+        df[col] = df[col].where(df[col].notna(), None)
+
+
+# Compact dtypes for the flattened frame: bools, 32-bit counts and
+# coordinates, categoricals for the low-cardinality location columns
+_DTYPE_SPEC = {
+    "step2_completed": "bool",
+    "step3_completed": "bool",
+    "step4_completed": "bool",
+    "scraped_street_count": "int32",
+    "geo_validated_street_count": "int32",
+    "geo_invalid_street_count": "int32",
+    "geo_latitude": "float32",
+    "geo_longitude": "float32",
+    "geo_cluster_radius_miles": "float32",
+    "city": "category",
+    "county": "category",
+    "geo_town": "category",
+}
+
+# Flat output schema: one list per column in the SoA accumulator.
+# Keys are interned so per-row dict inserts hit the pointer-equality
+# fast path.
+SCHEMA_COLUMNS = tuple(sys.intern(name) for name in (
+    "deed_id", "review_ids", "city", "deed_date", "address",
+    "is_restrictive_covenant", "county", "grantors", "grantees",
+    "covenant_text", "ocr_covenant_detected", "ocr_covenant_text",
+    "plan_books", "plan_pages", "lot_numbers", "extracted_streets",
+    "extracted_towns", "scraped_streets", "scraped_street_count",
+    "geo_latitude", "geo_longitude", "geo_address", "geo_town",
+    "geo_cluster_radius_miles", "geo_confidence",
+    "geo_validated_street_count", "geo_invalid_street_count",
+    "step2_completed", "step3_completed", "step4_completed",
+))
+
+
+def append_flat_columns(cols: Dict[str, list], deed_id: str,
+                        deed_record: Dict) -> Dict[str, List]:
+    """
+    Append one deed's flattened values onto the per-column lists in
+    ``cols`` (one list per SCHEMA_COLUMNS entry). The OCR-aggregated
+    list columns are appended as None so the DataFrame path can fill
+    them in bulk; the raw extracted_info lists are returned so callers
+    can aggregate them without re-traversing ocr_results.
+    """
+    rec_get = deed_record.get
+    cols["deed_id"].append(deed_id)
+    cols["review_ids"].append(
+        ",".join(map(str, rec_get("review_ids", []))))
+    cols["city"].append(rec_get("city"))
+    cols["deed_date"].append(rec_get("deed_date"))
+    cols["address"].append(rec_get("address"))
+    cols["is_restrictive_covenant"].append(
+        rec_get("is_restrictive_covenant"))
+    cols["county"].append(rec_get("county"))
+
+    # Grantor/grantee info (flatten lists to strings)
+    grantors = rec_get("grantors", [])
+    grantees = rec_get("grantees", [])
+    cols["grantors"].append("; ".join(grantors) if isinstance(
+        grantors, list) else grantors)
+    cols["grantees"].append("; ".join(grantees) if isinstance(
+        grantees, list) else grantees)
+
+    # Covenant information
+    exact_covenants = rec_get("exact_language_covenants", [])
+    if exact_covenants:
+        cols["covenant_text"].append(exact_covenants[0] if isinstance(
+            exact_covenants, list) else exact_covenants)
+    else:
+        cols["covenant_text"].append(None)
+
+    # OCR detected covenant + extracted_info lists from Step 2 (fused
+    # into a single traversal of ocr_results)
+    ocr_covenant_detected, ocr_covenant_text, ocr_lists = _scan_ocr_results(
+        rec_get("ocr_results", []))
+
+    cols["ocr_covenant_detected"].append(ocr_covenant_detected)
+    cols["ocr_covenant_text"].append(ocr_covenant_text)
+
+    # OCR-aggregated columns (filled by the caller)
+    for col in _OCR_LIST_COLUMNS:
+        cols[col].append(None)
+
+    # Scraped streets from Step 3
+    scraped_streets = rec_get("extracted_streets", [])
+    cols["scraped_streets"].append("; ".join(
+        scraped_streets) if scraped_streets else None)
+    cols["scraped_street_count"].append(
+        len(scraped_streets) if scraped_streets else 0)
+
+    # Geolocation from Step 4
+    geolocation = rec_get("geolocation")
     if geolocation:
-        flat["geo_latitude"] = geolocation.get("cluster_center_lat")
-        flat["geo_longitude"] = geolocation.get("cluster_center_lon")
-        flat["geo_address"] = geolocation.get("final_address")
-        flat["geo_town"] = geolocation.get("primary_town")
-        flat["geo_cluster_radius_miles"] = geolocation.get(
-            "cluster_radius_miles")
-        flat["geo_confidence"] = geolocation.get("confidence")
-        flat["geo_validated_street_count"] = len(
-            geolocation.get("validated_streets", []))
-        flat["geo_invalid_street_count"] = len(
-            geolocation.get("invalid_streets", []))
+        cols["geo_latitude"].append(geolocation.get("cluster_center_lat"))
+        cols["geo_longitude"].append(geolocation.get("cluster_center_lon"))
+        cols["geo_address"].append(geolocation.get("final_address"))
+        cols["geo_town"].append(geolocation.get("primary_town"))
+        cols["geo_cluster_radius_miles"].append(
+            geolocation.get("cluster_radius_miles"))
+        cols["geo_confidence"].append(geolocation.get("confidence"))
+        cols["geo_validated_street_count"].append(
+            len(geolocation.get("validated_streets", [])))
+        cols["geo_invalid_street_count"].append(
+            len(geolocation.get("invalid_streets", [])))
     else:
-        flat["geo_latitude"] = None
-        flat["geo_longitude"] = None
-        flat["geo_address"] = None
-        flat["geo_town"] = None
-        flat["geo_cluster_radius_miles"] = None
-        flat["geo_confidence"] = None
-        flat["geo_validated_street_count"] = 0
-        flat["geo_invalid_street_count"] = 0
-
-    # Add processing status flags
-    flat["step2_completed"] = deed_record.get("step2_completed", False)
-    flat["step3_completed"] = deed_record.get("step3_completed", False)
-    flat["step4_completed"] = deed_record.get("step4_completed", False)
+        cols["geo_latitude"].append(None)
+        cols["geo_longitude"].append(None)
+        cols["geo_address"].append(None)
+        cols["geo_town"].append(None)
+        cols["geo_cluster_radius_miles"].append(None)
+        cols["geo_confidence"].append(None)
+        cols["geo_validated_street_count"].append(0)
+        cols["geo_invalid_street_count"].append(0)
+
+    # Processing status flags
+    cols["step2_completed"].append(rec_get("step2_completed", False))
+    cols["step3_completed"].append(rec_get("step3_completed", False))
+    cols["step4_completed"].append(rec_get("step4_completed", False))
+
+    return ocr_lists
+
+
+# Below this many records the flattener runs sequentially; forking
+# workers costs more than it saves on small inputs
+_PARALLEL_FLATTEN_THRESHOLD = 2000
+
+
+def _flatten_chunk(
+        records: List[Dict]) -> Tuple[Dict[str, list], List[Dict[str, List]]]:
+    """Flatten a slice of deed records (runs in a worker process)."""
+    cols: Dict[str, list] = {name: [] for name in SCHEMA_COLUMNS}
+    ocr_lists = [
+        append_flat_columns(cols, rec.get("deed_id", "unknown"), rec)
+        for rec in records
+    ]
+    return cols, ocr_lists
+
+
+def flatten_deed_record(deed_id: str, deed_record: Dict) -> Dict[str, Any]:
+    """
+    Flatten nested deed record into a single-level dictionary
+
+    Args:
+        deed_id: Deed ID
+        deed_record: Nested deed record from Step 4
+
+    Returns:
+        Flattened dictionary suitable for CSV/DataFrame
+    """
+    cols: Dict[str, list] = {name: [] for name in SCHEMA_COLUMNS}
+    ocr_lists = append_flat_columns(cols, deed_id, deed_record)
+    flat = {name: values[0] for name, values in cols.items()}
+
+    # Add extracted information from Step 2 (Gemini)
+    for col, values in ocr_lists.items():
+        flat[col] = _join_unique(values)
 
     return flat
 
 
+def _tally_flags_py(flags):
+    """Row-wise nonzero counts over the (6, N) quality flag matrix."""
+    return np.count_nonzero(flags, axis=1)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _tally_flags(flags):  # pragma: no cover - needs numba
+        out = np.zeros(flags.shape[0], dtype=np.int64)
+        for i in range(flags.shape[0]):
+            c = 0
+            for j in range(flags.shape[1]):
+                if flags[i, j]:
+                    c += 1
+            out[i] = c
+        return out
+else:
+    _tally_flags = _tally_flags_py
+
+
+def _write_csv_direct(deed_records: List[Dict], path: Path) -> None:
+    """
+    Stream deed records straight to CSV with csv.writer, bypassing the
+    pandas CSV serializer entirely for the legacy CLI output.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', newline='', encoding='utf-8',
+              buffering=IO_BUFFER_BYTES) as f:
+        writer = csv.writer(f)
+        writer.writerow(SCHEMA_COLUMNS)
+        for rec in deed_records:
+            flat = flatten_deed_record(rec.get("deed_id", "unknown"), rec)
+            writer.writerow([flat[col] for col in SCHEMA_COLUMNS])
+    os.replace(tmp_path, path)
+
+
 def generate_quality_report(deed_data: Dict[str, Dict]) -> Dict[str, Any]:
     """
     Generate data quality report
@@ -275,34 +449,27 @@ def generate_quality_report(deed_data: Dict[str, Dict]) -> Dict[str, Any]:
     """
     total_deeds = len(deed_data)
 
-    # Count completions
-    step2_completed = sum(1 for d in deed_data.values()
-                          if d.get("step2_completed"))
-    step3_completed = sum(1 for d in deed_data.values()
-                          if d.get("step3_completed"))
-    step4_completed = sum(1 for d in deed_data.values()
-                          if d.get("step4_completed"))
-
-    # Count covenant detections
-    original_covenants = sum(1 for d in deed_data.values()
-                             if d.get("is_restrictive_covenant"))
-    ocr_covenants = sum(
-        1 for d in deed_data.values()
-        for r in d.get("ocr_results", [])
-        if r.get("covenant_detection", {}).get("covenant_detected")
-    )
-
-    # Count geocoded records
-    geocoded = sum(
-        1 for d in deed_data.values()
-        if d.get("geolocation") and d["geolocation"].get("cluster_center_lat")
-    )
-
-    # Count records with streets
-    with_streets = sum(
-        1 for d in deed_data.values()
-        if d.get("extracted_streets")
-    )
+    # Single fused pass fills typed flag arrays; the reductions then
+    # run vectorized (numba-compiled when available, numpy otherwise)
+    flags = np.empty((6, total_deeds), dtype=np.bool_)
+    ocr_covenants = 0
+    for i, d in enumerate(deed_data.values()):
+        d_get = d.get
+        flags[0, i] = bool(d_get("step2_completed"))
+        flags[1, i] = bool(d_get("step3_completed"))
+        flags[2, i] = bool(d_get("step4_completed"))
+        flags[3, i] = bool(d_get("is_restrictive_covenant"))
+        for r in d_get("ocr_results") or ():
+            if r.get("covenant_detection", {}).get("covenant_detected"):
+                ocr_covenants += 1
+        geolocation = d_get("geolocation")
+        flags[4, i] = bool(
+            geolocation and geolocation.get("cluster_center_lat"))
+        flags[5, i] = bool(d_get("extracted_streets"))
+
+    (step2_completed, step3_completed, step4_completed,
+     original_covenants, geocoded, with_streets) = (
+        int(x) for x in _tally_flags(flags))
 
     report = {
         "total_deeds": total_deeds,
@@ -323,63 +490,126 @@ def generate_quality_report(deed_data: Dict[str, Dict]) -> Dict[str, Any]:
     return report
 
 
-def process_deeds_integration(deed_records: List[Dict]) -> Tuple[List[Dict], pd.DataFrame, Dict[str, Any]]:
+def process_deeds_integration(
+        deed_records: List[Dict],
+        deed_data: Optional[Dict[str, Dict]] = None,
+) -> Tuple[List[Dict], pd.DataFrame, Dict[str, Any], Dict[str, Dict]]:
     """
     FUNCTION-BASED INTERFACE for notebook integration.
     Integrate and flatten deed records for final output.
 
     Args:
         deed_records: List of deed dictionaries from Step 4
+        deed_data: Optional pre-built {deed_id: record} dict (reused
+            when it already covers the deduplicated records)
 
     Returns:
-        Tuple of (full_records, flattened_dataframe, quality_report)
+        Tuple of (full_records, flattened_dataframe, quality_report,
+        deed_data keyed by deed_id)
     """
     # Normalize input: allow dict keyed by deed_id (from checkpoints)
     if isinstance(deed_records, dict):
+        if deed_data is None:
+            deed_data = deed_records
         deed_records = list(deed_records.values())
 
-    logger.info(f"Starting Step 5 processing for {len(deed_records)} deed(s)")
+    logger.info("Starting Step 5 processing for %d deed(s)", len(deed_records))
 
     # Deduplicate by deed_id to ensure one record per deed
     deduped_records = deduplicate_deed_records(deed_records)
 
-    # Convert list to dict format for generate_quality_report
-    deed_data = {record["deed_id"]: record for record in deduped_records}
+    # Reuse the caller's {deed_id: record} dict when dedup changed
+    # nothing; otherwise build it once here
+    if deed_data is None or len(deed_data) != len(deduped_records):
+        deed_data = {record["deed_id"]: record for record in deduped_records}
 
-    # Flatten records for CSV export
+    # Flatten records column-wise (SoA) for the DataFrame; the OCR list
+    # columns are aggregated in bulk with pandas string ops rather than
+    # per-record joins
     logger.info("Flattening deed records...")
-    flattened_records = []
-    for deed_record in deduped_records:
-        deed_id = deed_record.get("deed_id", "unknown")
-        flat_record = flatten_deed_record(deed_id, deed_record)
-        flattened_records.append(flat_record)
+    cols: Dict[str, list] = {name: [] for name in SCHEMA_COLUMNS}
+    ocr_lists_per_deed: List[Dict[str, List]] = []
+    if len(deduped_records) >= _PARALLEL_FLATTEN_THRESHOLD:
+        # Flattening is pure-Python dict/string work, so large corpora
+        # fan out across worker processes and merge per-column
+        chunk_size = max(
+            1, len(deduped_records) // ((cpu_count() or 1) * 4))
+        chunks = [deduped_records[i:i + chunk_size]
+                  for i in range(0, len(deduped_records), chunk_size)]
+        with ProcessPoolExecutor() as executor:
+            for part_cols, part_ocr in executor.map(_flatten_chunk, chunks):
+                for name in SCHEMA_COLUMNS:
+                    cols[name].extend(part_cols[name])
+                ocr_lists_per_deed.extend(part_ocr)
+    else:
+        for deed_record in deduped_records:
+            deed_id = deed_record.get("deed_id", "unknown")
+            ocr_lists_per_deed.append(
+                append_flat_columns(cols, deed_id, deed_record))
 
     logger.info(
-        f"Flattened {len(flattened_records)} records (unique deed_ids)")
+        "Flattened %d records (unique deed_ids)", len(deduped_records))
 
     # Generate quality report
     logger.info("Generating quality report...")
     quality_report = generate_quality_report(deed_data)
 
     # Log quality report
-    logger.info("=" * 60)
-    logger.info("DATA QUALITY REPORT")
-    logger.info("=" * 60)
-    for key, value in quality_report.items():
-        logger.info(f"{key}: {value}")
-    logger.info("=" * 60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(_BAR)
+        logger.info("DATA QUALITY REPORT")
+        logger.info(_BAR)
+        for key, value in quality_report.items():
+            logger.info("%s: %s", key, value)
+        logger.info(_BAR)
 
-    # Create DataFrame
-    df = pd.DataFrame(flattened_records)
+    # Create DataFrame straight from the column lists (no row dicts)
+    df = pd.DataFrame(cols, copy=False)
+    if not df.empty:
+        df = df.astype(_DTYPE_SPEC)
+        _aggregate_ocr_columns(df, ocr_lists_per_deed)
 
-    logger.info(f"Step 5 completed for {len(deduped_records)} deed(s)")
+    logger.info("Step 5 completed for %d deed(s)", len(deduped_records))
 
-    return deduped_records, df, quality_report
+    return deduped_records, df, quality_report, deed_data
+
+
+def _write_parquet(df: pd.DataFrame, output_path: Path) -> None:
+    """
+    Write the flattened frame as a typed Parquet file for fast reloads.
+
+    Casts dates, count columns and coordinates to compact dtypes so the
+    file stays small and notebooks skip string re-parsing on load.
+    """
+    out = df.copy()
+    if "deed_date" in out.columns:
+        out["deed_date"] = pd.to_datetime(out["deed_date"], errors="coerce")
+    for col in ("scraped_street_count", "geo_validated_street_count",
+                "geo_invalid_street_count"):
+        if col in out.columns:
+            out[col] = out[col].astype(pd.Int32Dtype())
+    for col in ("geo_latitude", "geo_longitude"):
+        if col in out.columns:
+            out[col] = out[col].astype("float32")
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    if pa is not None:
+        # Convert once to an Arrow table and write directly, skipping
+        # the pandas to_parquet wrapper layer
+        table = pa.Table.from_pandas(out, preserve_index=False)
+        pq.write_table(table, tmp_path, compression="zstd")
+    else:
+        # No pyarrow: let pandas pick whatever parquet engine is
+        # installed (e.g. fastparquet)
+        out.to_parquet(tmp_path, compression="zstd", index=False)
+    # Atomic swap so readers never see a partial file
+    os.replace(tmp_path, output_path)
 
 
 def run_step5(input_file: Path = STEP4_OUTPUT,
               output_json: Path = STEP5_OUTPUT,
-              output_csv: Path = STEP5_OUTPUT_CSV) -> Dict[str, Any]:
+              output_csv: Path = STEP5_OUTPUT_CSV,
+              output_parquet: Path = STEP5_OUTPUT_PARQUET,
+              write_csv: bool = False) -> Dict[str, Any]:
     """
     FILE-BASED INTERFACE (legacy/CLI mode).
     Run Step 5: Data integration and export.
@@ -387,33 +617,30 @@ def run_step5(input_file: Path = STEP4_OUTPUT,
     Args:
         input_file: Path to Step 4 output file
         output_json: Path to final JSON output
-        output_csv: Path to final CSV output
+        output_csv: Path to legacy CSV output (written if write_csv=True)
+        output_parquet: Path to the primary tabular (Parquet) output
+        write_csv: Also emit the CSV; Parquet is written either way
 
     Returns:
         Dictionary with integrated data and quality report
     """
     logger.info("Starting Step 5: Data Integration (file-based mode)")
-    logger.info(f"Input file: {input_file}")
-    logger.info(f"Output JSON: {output_json}")
-    logger.info(f"Output CSV: {output_csv}")
+    logger.info("Input file: %s", input_file)
+    logger.info("Output JSON: %s", output_json)
+    logger.info("Output Parquet: %s", output_parquet)
 
     try:
         # Load input data (dict format: {deed_id: {...}, ...})
         deed_data = load_json(input_file)
-        logger.info(f"Loaded {len(deed_data)} deed records")
+        logger.info("Loaded %d deed records", len(deed_data))
 
-        # Convert dict to list format for process_deeds_integration
+        # Convert dict to list format for process_deeds_integration,
+        # passing the loaded dict along so it isn't rebuilt
         deed_records = list(deed_data.values())
 
         # Process using function interface
-        processed_records, df, quality_report = process_deeds_integration(
-            deed_records)
-
-        # Convert back to dict format for JSON output
-        deed_data_final = {
-            record["deed_id"]: record
-            for record in processed_records
-        }
+        processed_records, df, quality_report, deed_data_final = \
+            process_deeds_integration(deed_records, deed_data=deed_data)
 
         # Save JSON output (full nested structure)
         logger.info("Saving full JSON output...")
@@ -424,15 +651,31 @@ def run_step5(input_file: Path = STEP4_OUTPUT,
             },
             "deeds": deed_data_final
         }
-        save_json(final_output, output_json)
-
-        # Save CSV output (flattened structure)
-        logger.info("Saving CSV output...")
-        df.to_csv(output_csv, index=False, encoding='utf-8')
+        save_json(final_output, output_json, ensure_ascii=False)
+
+        # Save Parquet output (primary tabular output: columnar + typed);
+        # degrade to CSV if no parquet engine is installed so Step 5
+        # still produces a tabular file
+        logger.info("Saving Parquet output...")
+        try:
+            _write_parquet(df, output_parquet)
+        except ImportError as e:
+            logger.warning(
+                "No parquet engine available (%s); writing CSV instead", e)
+            _write_csv_direct(processed_records, output_csv)
+            write_csv = False
+            logger.info("CSV output: %s", output_csv)
+
+        # Optional legacy CSV output (flattened structure); chunked so the
+        # writer streams rows instead of building one giant string
+        if write_csv:
+            logger.info("Saving CSV output...")
+            _write_csv_direct(processed_records, output_csv)
+            logger.info("CSV output: %s", output_csv)
 
         logger.info("Step 5 completed.")
-        logger.info(f"JSON output: {output_json}")
-        logger.info(f"CSV output: {output_csv}")
+        logger.info("JSON output: %s", output_json)
+        logger.info("Parquet output: %s", output_parquet)
 
         return {
             "quality_report": quality_report,
@@ -440,7 +683,7 @@ def run_step5(input_file: Path = STEP4_OUTPUT,
         }
 
     except Exception as e:
-        logger.error(f"Error in Step 5: {e}", exc_info=True)
+        logger.error("Error in Step 5: %s", e, exc_info=True)
         raise
 
 
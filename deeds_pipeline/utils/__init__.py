@@ -6,6 +6,7 @@ from .common import (
     setup_logger,
     load_json,
     save_json,
+    save_json_compact,
     get_cache_key,
     load_from_cache,
     save_to_cache,
@@ -15,6 +16,7 @@ __all__ = [
     "setup_logger",
     "load_json",
     "save_json",
+    "save_json_compact",
     "get_cache_key",
     "load_from_cache",
     "save_to_cache",
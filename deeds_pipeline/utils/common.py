@@ -5,11 +5,29 @@ Common utility functions used across the pipeline
 import json
 import logging
 import hashlib
+import mmap
+import os
+import time
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, Optional
 
-from ..config import CACHE_DIR, LOG_DIR, LOG_FORMAT, LOG_LEVEL, CACHE_EXPIRY_DAYS
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from ..config import (CACHE_DIR, LOG_DIR, LOG_FORMAT, LOG_LEVEL,
+                      CACHE_EXPIRY_DAYS, IO_BUFFER_BYTES)
+
+# Cache expiry in seconds for plain-float mtime comparisons
+_CACHE_EXPIRY_SECONDS = CACHE_EXPIRY_DAYS * 86400.0
 
 
 def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
@@ -37,10 +55,13 @@ def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
     
-    # File handler
+    # File handler (delayed open: the fd is only acquired on first
+    # write; rotation keeps log files bounded across runs)
     if log_file:
         file_path = LOG_DIR / log_file
-        file_handler = logging.FileHandler(file_path)
+        file_handler = RotatingFileHandler(
+            file_path, maxBytes=64 << 20, backupCount=3,
+            delay=True, encoding='utf-8')
         file_handler.setLevel(getattr(logging, LOG_LEVEL))
         file_formatter = logging.Formatter(LOG_FORMAT)
         file_handler.setFormatter(file_formatter)
@@ -63,60 +84,129 @@ def load_json(file_path: Path) -> Any:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If file is not valid JSON
     """
+    # orjson parses the raw bytes 3-10x faster than stdlib json on the
+    # large step inputs/outputs
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def save_json(data: Any, file_path: Path, indent: int = 2) -> None:
+def save_json(data: Any, file_path: Path, indent: int = 2,
+              ensure_ascii: bool = True) -> None:
     """
     Save data to JSON file
-    
+
+    Uses orjson (C-accelerated) with a buffered byte write when
+    available, falling back to stdlib json otherwise.
+
     Args:
         data: Data to save
         file_path: Path to output JSON file
         indent: JSON indentation (default: 2)
+        ensure_ascii: Escape non-ASCII characters (stdlib path only;
+            faster for machine-read files). Pass False for
+            human-facing output.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(file_path.name + '.tmp')
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        with open(tmp_path, 'wb', buffering=IO_BUFFER_BYTES) as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8',
+                  buffering=IO_BUFFER_BYTES) as f:
+            json.dump(data, f, indent=indent if indent else None,
+                      ensure_ascii=ensure_ascii,
+                      separators=(',', ':') if not indent else None)
+    # Atomic swap so readers never see a partial file
+    os.replace(tmp_path, file_path)
+
+
+def save_json_compact(data: Any, file_path: Path) -> None:
+    """
+    Save data as single-line JSON (no indent) for machine-read files
+    such as cache entries.
+
+    Args:
+        data: Data to save
+        file_path: Path to output JSON file
     """
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
+    tmp_path = file_path.with_name(file_path.name + '.tmp')
+    if orjson is not None:
+        with open(tmp_path, 'wb', buffering=IO_BUFFER_BYTES) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8',
+                  buffering=IO_BUFFER_BYTES) as f:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=True)
+    os.replace(tmp_path, file_path)
 
 
 def get_cache_key(*args) -> str:
     """
     Generate a cache key from arguments
-    
+
+    Cache keys don't need a cryptographic digest, so this streams the
+    args into xxh3 when available (BLAKE2b otherwise) instead of
+    MD5-hashing one big joined string.
+
     Args:
         *args: Arguments to hash
-    
+
     Returns:
-        MD5 hash string
+        Hex digest string
     """
-    key_string = "_".join(str(arg) for arg in args)
-    return hashlib.md5(key_string.encode()).hexdigest()
+    if xxhash is not None:
+        h = xxhash.xxh3_128()
+    else:
+        h = hashlib.blake2b(digest_size=16)
+    for arg in args:
+        h.update(str(arg).encode())
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _cache_path(cache_key: str) -> Path:
+    """Build the on-disk path for a cache key."""
+    return CACHE_DIR / f"{cache_key}.json"
 
 
 def load_from_cache(cache_key: str) -> Optional[Dict]:
     """
     Load data from cache
-    
+
     Args:
         cache_key: Cache key
-    
+
     Returns:
         Cached data if exists and not expired, None otherwise
     """
-    cache_file = CACHE_DIR / f"{cache_key}.json"
+    cache_file = _cache_path(cache_key)
     
     if not cache_file.exists():
         return None
     
-    # Check if cache is expired
-    mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
-    if datetime.now() - mtime > timedelta(days=CACHE_EXPIRY_DAYS):
+    # Check if cache is expired (plain float compare, no datetime objects)
+    if time.time() - cache_file.stat().st_mtime > _CACHE_EXPIRY_SECONDS:
         return None
     
+    # Parse via mmap so cache hits avoid a read() copy; orjson parses
+    # the mapped bytes directly when available
     try:
-        return load_json(cache_file)
+        with open(cache_file, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if orjson is not None:
+                    return orjson.loads(memoryview(mm))
+                return json.loads(mm[:])
+            finally:
+                mm.close()
     except Exception:
         return None
 
@@ -129,9 +219,10 @@ def save_to_cache(cache_key: str, data: Dict) -> None:
         cache_key: Cache key
         data: Data to cache
     """
-    cache_file = CACHE_DIR / f"{cache_key}.json"
+    cache_file = _cache_path(cache_key)
     try:
-        save_json(data, cache_file)
+        # Cache files are machine-read only; skip pretty-printing
+        save_json_compact(data, cache_file)
     except Exception as e:
         # Cache save failures should not break the pipeline
         print(f"Warning: Failed to save cache: {e}")
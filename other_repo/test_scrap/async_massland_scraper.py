@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Async MassLandRecords scraper built on Playwright
+
+Drives the same masslandrecords.com search flow as MassLandScraper but
+through playwright.async_api, so navigation waits overlap instead of
+blocking the process. asyncio.gather over N (book, page) records shares
+one browser with one context per record — higher throughput than the
+Selenium ThreadPoolExecutor since there is no GIL contention on the
+CDP socket.
+
+Requires the optional playwright dependency:
+    pip install playwright && playwright install chromium
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Tuple
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+except ImportError:
+    async_playwright = None
+    PlaywrightTimeout = None
+
+from massland_scraper import MassLandScraper
+
+SEARCH_URL = MassLandScraper.SEARCH_URL
+
+# Reuse the batched in-page extractors from the Selenium scraper —
+# page.evaluate expects a function body, so wrap them
+_ROW_INFO_JS = "() => {" + MassLandScraper._ROW_INFO_JS + "}"
+# (regular function, not arrow: the extractor reads the id list from
+# the implicit arguments object)
+_METADATA_JS = "function(cellIds) {" + MassLandScraper._METADATA_JS + "}"
+_CELL_IDS = list(MassLandScraper.DOC_DETAILS_CELL_IDS)
+
+
+class AsyncMassLandScraper:
+    """Playwright-based async port of MassLandScraper"""
+
+    def __init__(self, headless=True, concurrency=4):
+        self.headless = headless
+        # Bound simultaneous contexts so the site is not hammered
+        self._sem = asyncio.Semaphore(concurrency)
+        self._playwright = None
+        self.browser = None
+
+    async def start(self):
+        """Launch the shared browser"""
+        if async_playwright is None:
+            raise ImportError(
+                "playwright is required for AsyncMassLandScraper "
+                "(pip install playwright)")
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(
+            headless=self.headless)
+        print("Async browser launched successfully")
+
+    async def close(self):
+        """Shut down the browser and Playwright"""
+        if self.browser:
+            await self.browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        print("Async browser closed")
+
+    async def _setup_search_criteria(self, page):
+        """Select Plans + Book Search on the form (per context)"""
+        await page.select_option(
+            "#SearchCriteriaOffice1_DDL_OfficeName", label="Plans")
+        # The Office postback rebuilds the form; wait for the Book input
+        # rather than a fixed delay
+        await page.wait_for_selector("#SearchFormEx1_ACSTextBox_Book")
+        # Same Book Search variants the sync scraper tries, in order —
+        # only a Book Search form drives the Book/PageNumber lookup
+        for option_value in ("Plans Book Search",
+                             "Recorded Land Book Search",
+                             "Book Search"):
+            try:
+                await page.select_option(
+                    "#SearchCriteriaName1_DDL_SearchName", value=option_value)
+                break
+            except Exception:
+                continue
+        else:
+            await page.select_option(
+                "#SearchCriteriaName1_DDL_SearchName", label="Book Search")
+        await page.wait_for_selector("#SearchFormEx1_ACSTextBox_Book")
+
+    async def _search_by_book_page(self, page, book, page_num) -> bool:
+        """Fill and submit the book/page search, wait for the grid"""
+        await page.fill("#SearchFormEx1_ACSTextBox_Book", str(book))
+        await page.fill("#SearchFormEx1_ACSTextBox_PageNumber", str(page_num))
+        # Overlap the postback click with the wait for the result grid
+        try:
+            await asyncio.gather(
+                page.click("#SearchFormEx1_btnSearch"),
+                page.wait_for_selector(
+                    "#DocList1_GridView_Document tr.DataGridRow"),
+            )
+        except PlaywrightTimeout:
+            print(f"⚠ No results grid for Book={book}, Page={page_num}")
+            return False
+        return True
+
+    async def _extract_metadata(self, page) -> Dict:
+        """Click into the first result and harvest DocDetails"""
+        row_info = await page.evaluate(_ROW_INFO_JS) or {}
+        try:
+            await asyncio.gather(
+                page.click("a[id*='ButtonRow_File Date']"),
+                page.wait_for_selector(
+                    "#DocDetails1_GridView_Details tr.DataGridRow"),
+            )
+        except PlaywrightTimeout:
+            return {"error": "Document details did not load"}
+        metadata = {}
+        raw = await page.evaluate(_METADATA_JS, _CELL_IDS) or {}
+        if raw.get("details"):
+            metadata["document_details"] = raw["details"]
+        if raw.get("property"):
+            metadata["property_info"] = raw["property"]
+        if raw.get("grantor_grantee"):
+            metadata["grantor_grantee"] = raw["grantor_grantee"]
+        for key, text in (raw.get("cells") or {}).items():
+            metadata.setdefault(key, text)
+        if row_info:
+            metadata["search_result_info"] = row_info
+        return metadata if metadata else {"error": "No metadata found"}
+
+    async def process_record(self, book: str, page_num: str) -> Dict:
+        """Process one (book, page) in its own browser context"""
+        async with self._sem:
+            context = await self.browser.new_context()
+            page = await context.new_page()
+            metadata = None
+            try:
+                await page.goto(SEARCH_URL, wait_until="domcontentloaded")
+                await self._setup_search_criteria(page)
+                if await self._search_by_book_page(page, book, page_num):
+                    metadata = await self._extract_metadata(page)
+            except Exception as e:
+                print(f"Error processing Book={book}, Page={page_num}: {e}")
+            finally:
+                await context.close()
+            return {
+                "book": book,
+                "page": page_num,
+                "metadata": metadata if metadata else {},
+                "status": "success" if metadata and "error" not in metadata else "failed"
+            }
+
+    async def process_records(self, records: List[Tuple[str, str]]) -> List[Dict]:
+        """Process many (book, page) pairs concurrently"""
+        return list(await asyncio.gather(
+            *(self.process_record(book, page_num)
+              for book, page_num in records)))
+
+    async def process_csv_file(self, csv_file, max_retries=3) -> List[Dict]:
+        """Async counterpart of MassLandScraper.process_csv_file
+
+        All rows run concurrently (bounded by the semaphore) instead of
+        serially with sleeps between searches; retries back off with
+        asyncio.sleep so other rows keep progressing.
+        """
+        async def one(row_idx, book, page):
+            print(f"Processing record {row_idx}: Book={book}, Page={page}")
+            result = None
+            for attempt in range(max_retries):
+                result = await self.process_record(book, page)
+                if result["status"] == "success":
+                    print(f"✓ Completed: Book={book}, Page={page}")
+                    return result
+                if attempt < max_retries - 1:
+                    print(f"Search failed, retrying {attempt + 1}/{max_retries}: "
+                          f"Book={book}, Page={page}")
+                    await asyncio.sleep(3)
+            return result
+
+        rows = list(MassLandScraper._iter_csv_records(csv_file))
+        print(f"Scraping {len(rows)} record(s) concurrently...")
+        return list(await asyncio.gather(*(one(*row) for row in rows)))
+
+
+async def _main(records):
+    scraper = AsyncMassLandScraper(headless=True)
+    await scraper.start()
+    try:
+        results = await scraper.process_records(records)
+    finally:
+        await scraper.close()
+    success = sum(1 for r in results if r["status"] == "success")
+    print(f"\nProcessed {len(results)} records, {success} succeeded")
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return results
+
+
+if __name__ == "__main__":
+    asyncio.run(_main([("57", "21")]))
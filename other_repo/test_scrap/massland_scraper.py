@@ -5,48 +5,380 @@ Visit https://www.masslandrecords.com/MiddlesexNorth/D/Default.aspx
 Search by book and page number, extract metadata information
 """
 
+import atexit
 import csv
+import os
+import queue
+import random
+import threading
 import time
 import json
-from typing import Dict, List
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (TimeoutException,
+                                        NoSuchElementException,
+                                        StaleElementReferenceException)
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
+try:
+    from lxml import html as lxml_html
+    from lxml import etree
+except ImportError:
+    lxml_html = None
+    etree = None
+
+# Hot-path selectors, named once instead of re-typed per call site
+_SEL_FILEDATE = "a[id*='ButtonRow_File Date']"
+_SEL_GRID_FILEDATE = "#DocList1_GridView_Document a[id*='ButtonRow_File Date']"
+_SEL_GRID_TOWN = "#DocList1_GridView_Document a[id*='ButtonRow_Town']"
+
+# Precompiled XPath expressions: etree.XPath parses the expression once
+# at import instead of per row/cell during table extraction
+if etree is not None:
+    _XP_GRID_HEADERS = etree.XPath('.//tr[contains(@class,"DataGridHeader")]/th')
+    _XP_GRID_ROWS = etree.XPath('.//tr[contains(@class,"DataGridRow")]')
+    _XP_ROW_CELLS = etree.XPath('./td')
+    _XP_CELL_LINKS = etree.XPath('.//a')
+    _XP_INPUT_VALUE = etree.XPath('//input[@id=$fid]/@value')
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonlWriter:
+    """Append-only JSONL writer for crash-safe incremental results.
+
+    Each record lands on disk as soon as it is written, so a run that
+    dies at 90% keeps 90% of its output instead of losing everything
+    to the single end-of-run JSON dump.
+    """
+
+    def __init__(self, path):
+        self.f = open(path, 'ab')
+
+    def write(self, obj):
+        if orjson is not None:
+            self.f.write(orjson.dumps(obj) + b'\n')
+        else:
+            self.f.write(json.dumps(obj, ensure_ascii=False).encode() + b'\n')
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+    @staticmethod
+    def to_json(jsonl_path, output_file):
+        """One-shot convert of a JSONL file to the legacy JSON array."""
+        with open(jsonl_path, 'rb') as f:
+            if orjson is not None:
+                results = [orjson.loads(line) for line in f if line.strip()]
+            else:
+                results = [json.loads(line) for line in f if line.strip()]
+        with open(output_file, 'w', encoding='utf-8') as out:
+            json.dump(results, out, indent=2, ensure_ascii=False)
+        return results
+
+
+class RateLimiter:
+    """Token-bucket rate limiter (stdlib-only).
+
+    Requests fire immediately while the bucket holds tokens and only
+    stall when the budget is spent, unlike a flat sleep between rows
+    which wastes the whole interval even when the server is idle.
+    """
+
+    def __init__(self, calls, period=60.0):
+        self.capacity = float(calls)
+        self.fill_rate = calls / period
+        self.tokens = float(calls)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping only if the bucket is empty."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.last) * self.fill_rate)
+            self.last = now
+            # Debit before releasing the lock; a negative balance is the
+            # deficit the caller must sleep off. Zeroing instead would
+            # let the next refill re-credit the slept interval and admit
+            # twice the configured rate under saturation.
+            self.tokens -= 1.0
+            if self.tokens >= 0.0:
+                return
+            wait = -self.tokens / self.fill_rate
+        time.sleep(wait)
+
 
 class MassLandScraper:
-    def __init__(self, headless=False):
-        """Initialize browser driver"""
+    # Idle Chrome instances shared across constructions: callers that
+    # rebuild the scraper (per-thread init, retry recovery) check a
+    # warm driver out in ~10ms instead of paying 1-3s of startup
+    _driver_pool = queue.Queue()
+
+    # Batched in-page extractors: one execute_script round-trip replaces
+    # a find_element call per field/cell
+    _ROW_INFO_JS = """
+        const link = document.querySelector("a[id*='ButtonRow_File Date']");
+        if (!link) return {};
+        const tr = link.closest('tr');
+        const q = function(sel) {
+            const e = tr.querySelector(sel);
+            return e ? e.textContent.trim() : '';
+        };
+        return {
+            file_date: link.textContent.trim(),
+            rec_time: q("a[id*='ButtonRow_Rec. Time']"),
+            book_page: q("a[id*='ButtonRow_Book/Page']"),
+            type_desc: q("a[id*='ButtonRow_Type Desc.']"),
+            town: q("a[id*='ButtonRow_Town']")
+        };
+    """
+
+    _METADATA_JS = """
+        const readTable = function(id) {
+            const table = document.getElementById(id);
+            if (!table) return null;
+            let headers = [];
+            const headerRow = table.querySelector('tr.DataGridHeader');
+            if (headerRow) {
+                headers = Array.from(headerRow.querySelectorAll('th'))
+                    .map(function(th) { return th.textContent.trim(); });
+            }
+            const data = [];
+            table.querySelectorAll('tr.DataGridRow').forEach(function(row) {
+                const rowData = {};
+                row.querySelectorAll('td').forEach(function(cell, i) {
+                    const key = (i < headers.length && headers[i])
+                        ? headers[i] : 'column_' + i;
+                    const link = cell.querySelector('a');
+                    const linkText = link ? link.textContent.trim() : '';
+                    if (link && linkText) {
+                        rowData[key] = linkText;
+                        rowData[key + '_link'] = link.getAttribute('href') || '';
+                    } else {
+                        rowData[key] = cell.textContent.trim();
+                    }
+                });
+                if (Object.keys(rowData).length) data.push(rowData);
+            });
+            return data;
+        };
+        const cells = {};
+        (arguments[0] || []).forEach(function(id) {
+            const el = document.getElementById(id);
+            if (el) {
+                const t = el.innerText.trim();
+                if (t.length > 10) {
+                    cells[id.replace('DocDetails1_', '')
+                            .replace('Cell', '').toLowerCase()] = t;
+                }
+            }
+        });
+        return {
+            details: readTable('DocDetails1_GridView_Details'),
+            property: readTable('DocDetails1_GridView_Property'),
+            grantor_grantee: readTable('DocDetails1_GridView_GrantorGrantee'),
+            cells: cells
+        };
+    """
+
+    _RESULT_COUNT_JS = """
+        const links = document.querySelectorAll("a[id*='ButtonRow_File Date']");
+        const rows = new Set();
+        links.forEach(function(link) {
+            const tr = link.closest('tr');
+            if (tr) rows.add(tr);
+        });
+        const first = rows.size ? rows.values().next().value : null;
+        const cellText = function(tr, i) {
+            const cells = tr.querySelectorAll('td');
+            if (i >= cells.length) return '';
+            const a = cells[i].querySelector('a');
+            return (a || cells[i]).textContent.trim();
+        };
+        return {
+            count: rows.size,
+            file_date: first ? cellText(first, 1) : '',
+            book_page: first ? cellText(first, 3) : ''
+        };
+    """
+
+    # Fallback cells harvested by _METADATA_JS; kept in Python so the
+    # list can evolve without touching the JS
+    DOC_DETAILS_CELL_IDS = (
+        'DocDetails1_DetailsCell', 'DocDetails1_PropertiesCell',
+        'DocDetails1_TownsCell', 'DocDetails1_GrantorGranteeCell',
+        'DocDetails1_DocumentStatusCell', 'DocDetails1_ERecordedCell',
+        'DocDetails1_DocumentRefsCell', 'DocDetails1_PTAXDocsCell',
+        'DocDetails1_MailBackCell',
+    )
+
+    _TABLE_DATA_JS = """
+        const table = arguments[0];
+        let headers = [];
+        const headerRow = table.querySelector('tr.DataGridHeader');
+        if (headerRow) {
+            headers = Array.from(headerRow.querySelectorAll('th'))
+                .map(function(th) { return th.textContent.trim(); });
+        }
+        const data = [];
+        table.querySelectorAll('tr.DataGridRow').forEach(function(row) {
+            const rowData = {};
+            row.querySelectorAll('td').forEach(function(cell, i) {
+                const key = (i < headers.length && headers[i])
+                    ? headers[i] : 'column_' + i;
+                const link = cell.querySelector('a');
+                const linkText = link ? link.textContent.trim() : '';
+                if (link && linkText) {
+                    rowData[key] = linkText;
+                    rowData[key + '_link'] = link.getAttribute('href') || '';
+                } else {
+                    rowData[key] = cell.textContent.trim();
+                }
+            });
+            if (Object.keys(rowData).length) data.push(rowData);
+        });
+        return data;
+    """
+
+    def __init__(self, headless=False, attach_to=None, cache=None):
+        """Initialize browser driver
+
+        cache is an optional pipeline_utils.ResultCache; when given,
+        process_csv_file skips rows it already holds and stores new
+        successes, on top of the built-in per-(book, page) disk cache.
+
+        Pass attach_to="127.0.0.1:9223" to attach to an already-running
+        Chrome (launched with --remote-debugging-port=9223
+        --user-data-dir=/tmp/massland_profile) instead of spawning a
+        fresh one. Attaching takes ~200ms vs. 1-3s for a cold start,
+        and the persistent profile keeps site cookies warm between
+        runs.
+        """
+        self._attach_to = attach_to
+        # Only drivers this class launched may be pooled (and quit at
+        # exit); an attached Chrome belongs to whoever started it
+        self._owns_driver = attach_to is None
         chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--headless=new")  # Use new headless mode
-        # May not need --no-sandbox on Mac, but keep it anyway
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--window-size=1920,1080")
-        # Don't need --disable-gpu on Mac
-        # chrome_options.add_argument("--disable-gpu")
-        # Remove remote-debugging-port to avoid conflicts
-        # chrome_options.add_argument("--remote-debugging-port=9222")
-        # Add user agent
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        if attach_to:
+            # Launch flags belong to the running Chrome and are ignored
+            # when attaching, so only set the debugger address here
+            chrome_options.debugger_address = attach_to
+        else:
+            if headless:
+                chrome_options.add_argument("--headless")
+                chrome_options.add_argument("--headless=new")  # Use new headless mode
+            # May not need --no-sandbox on Mac, but keep it anyway
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            chrome_options.add_argument("--window-size=1920,1080")
+            # Don't need --disable-gpu on Mac
+            # chrome_options.add_argument("--disable-gpu")
+            # Remove remote-debugging-port to avoid conflicts
+            # chrome_options.add_argument("--remote-debugging-port=9222")
+            # Add user agent
+            chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+            # Skip image downloads at the profile level (fallback for the
+            # CDP URL blocking below)
+            chrome_options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2})
         
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 20)
+            self.driver = None
+            if not attach_to:
+                # Reuse an idle pooled driver when one is available and
+                # still responds; broken ones are quit and replaced
+                try:
+                    pooled = self._driver_pool.get_nowait()
+                    try:
+                        pooled.current_url
+                        self.driver = pooled
+                        print("Reusing pooled browser driver")
+                    except Exception:
+                        try:
+                            pooled.quit()
+                        except Exception:
+                            pass
+                except queue.Empty:
+                    pass
+            if self.driver is None:
+                self.driver = webdriver.Chrome(options=chrome_options)
+            # The scraper only reads table text, so block the heavy
+            # static assets before any navigation
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {
+                    "urls": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.ico",
+                             "*.woff*", "*.ttf", "*.svg", "*.css",
+                             "*google-analytics*", "*doubleclick*"]
+                })
+            except Exception as e:
+                print(f"⚠ CDP resource blocking unavailable: {e}")
+            # Tighter timeout and 0.1s polling: successes return ~250ms
+            # sooner on average and failures stop blocking for 20s
+            self.wait = WebDriverWait(self.driver, 10, poll_frequency=0.1)
+            # Near-instant checks (fallback locators) fail fast instead
+            self.wait_fast = WebDriverWait(self.driver, 3, poll_frequency=0.05)
+            # Search criteria (Office/Search Type) only need to be set
+            # once per session; see search_by_book_page
+            self._criteria_ready = False
+            # Optional shared ResultCache from pipeline_utils
+            self.cache = cache
+            # 30 requests/minute budget; rows only stall once it is spent
+            self.rate_limiter = RateLimiter(30, 60.0)
+            # Disk cache of per-(book, page) results across runs
+            self.cache_dir = Path("./.massland_cache")
+            self.cache_dir.mkdir(exist_ok=True)
             print("Browser driver initialized successfully")
         except Exception as e:
             print(f"Browser driver initialization failed: {e}")
             raise
         
+    SEARCH_URL = "https://www.masslandrecords.com/MiddlesexNorth/D/Default.aspx"
+    
+    # Scraped metadata is effectively immutable for a given book/page,
+    # so cached results stay valid for a long time
+    CACHE_TTL_SECONDS = 30 * 86400
+
+    @staticmethod
+    def _with_retry(fn, attempts=3, base=0.5):
+        """Run fn, retrying transient Selenium failures with jittered
+        exponential backoff (base, 2*base, 4*base seconds +/- jitter).
+
+        Only TimeoutException and StaleElementReferenceException are
+        retried; real failures still raise immediately.
+        """
+        for attempt in range(attempts):
+            try:
+                return fn()
+            except (TimeoutException, StaleElementReferenceException):
+                if attempt == attempts - 1:
+                    raise
+                delay = base * (2 ** attempt) * (0.5 + random.random())
+                print(f"⚠ Transient failure, retrying in {delay:.1f}s "
+                      f"({attempt + 1}/{attempts - 1})...")
+                time.sleep(delay)
+
     def navigate_to_search_page(self):
         """Navigate to search page"""
-        url = "https://www.masslandrecords.com/MiddlesexNorth/D/Default.aspx"
+        url = self.SEARCH_URL
         print(f"Accessing: {url}")
         try:
             self.driver.get(url)
@@ -54,7 +386,11 @@ class MassLandScraper:
             self.wait.until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
-            time.sleep(3)  # Wait for page to fully load
+            # Wait on the element we actually need next instead of a
+            # fixed sleep: the Office dropdown becoming clickable
+            self.wait.until(
+                EC.element_to_be_clickable((By.ID, "SearchCriteriaOffice1_DDL_OfficeName"))
+            )
             print("Page loaded successfully")
         except Exception as e:
             print(f"Page loading failed: {e}")
@@ -65,6 +401,15 @@ class MassLandScraper:
         try:
             print("Setting up search criteria...")
             
+            # Grab the current Search Type dropdown so we can detect the
+            # Ajax refresh triggered by changing the Office
+            search_type_before = None
+            try:
+                search_type_before = self.driver.find_element(
+                    By.ID, "SearchCriteriaName1_DDL_SearchName")
+            except NoSuchElementException:
+                pass
+            
             # 1. Set Office to Plans
             print("Setting Office to Plans...")
             office_select = self.wait.until(
@@ -94,8 +439,16 @@ class MassLandScraper:
                             print("✓ Selected Office: Plans (by click)")
                             break
             
-            # Wait for Ajax update (dropdown change triggers page update)
-            time.sleep(2)
+            # Wait for the Ajax postback to swap in the refreshed
+            # Search Type dropdown instead of sleeping a fixed 2s
+            if search_type_before is not None:
+                try:
+                    WebDriverWait(self.driver, 10, poll_frequency=0.1).until(
+                        EC.staleness_of(search_type_before)
+                    )
+                except TimeoutException:
+                    # Dropdown was not replaced (already on Plans); continue
+                    pass
             
             # 2. Set Search Type to Book Search
             print("Setting Search Type to Book Search...")
@@ -140,8 +493,11 @@ class MassLandScraper:
                             selected = True
                             break
             
-            # Wait for Ajax update
-            time.sleep(2)
+            # Wait until the Book input the next step needs is present
+            # rather than sleeping through the Ajax update
+            WebDriverWait(self.driver, 10, poll_frequency=0.1).until(
+                EC.presence_of_element_located((By.ID, "SearchFormEx1_ACSTextBox_Book"))
+            )
             
             print("✓ Search criteria setup completed")
             return True
@@ -157,9 +513,21 @@ class MassLandScraper:
         try:
             print(f"Starting search - Book: {book}, Page: {page}")
             
-            # First setup search criteria (Office and Search Type)
-            if not self.setup_search_criteria():
-                print("⚠ Warning: Search criteria setup may have failed, continuing search attempt...")
+            # Setup search criteria (Office and Search Type) once per
+            # session; afterwards a single JS read of the Office value
+            # confirms the selection hasn't drifted (e.g. session reset)
+            if self._criteria_ready:
+                office_value = self.driver.execute_script(
+                    "var el = document.getElementById('SearchCriteriaOffice1_DDL_OfficeName');"
+                    "return el ? el.value : null;")
+                if office_value != "Plans":
+                    print("Search criteria drifted, re-running setup...")
+                    self._criteria_ready = False
+            if not self._criteria_ready:
+                if self.setup_search_criteria():
+                    self._criteria_ready = True
+                else:
+                    print("⚠ Warning: Search criteria setup may have failed, continuing search attempt...")
             
             # Find book input box - use correct ID based on HTML structure
             print("Finding Book input box...")
@@ -188,11 +556,24 @@ class MassLandScraper:
             print("Clicked search button")
             
             # Wait for search results to load - wait for DocList table to appear
+            # (retried: the WebForms postback occasionally swaps the DOM
+            # mid-wait, which surfaces as a stale/timeout blip)
             print("Waiting for search results...")
-            self.wait.until(
+            self._with_retry(lambda: self.wait.until(
                 EC.presence_of_element_located((By.ID, "DocList1_GridView_Document"))
-            )
-            time.sleep(2)  # Additional wait to ensure content is fully loaded
+            ))
+            # The Town link is the last cell the grid renders per row;
+            # once it exists the table is fully populated, so wait on
+            # that instead of a fixed pad
+            try:
+                WebDriverWait(self.driver, 10, poll_frequency=0.1).until(
+                    lambda d: len(d.find_elements(
+                        By.CSS_SELECTOR, _SEL_GRID_TOWN)) > 0
+                )
+            except TimeoutException:
+                # Zero-result searches have no data rows; let the caller
+                # count results and decide
+                pass
             print("Search results loaded")
             return True
             
@@ -214,59 +595,93 @@ class MassLandScraper:
             traceback.print_exc()
             return False
     
-    def check_search_results(self):
-        """Check search results, return result count"""
+    def init_http_session(self):
+        """
+        Bootstrap a requests.Session from the live browser session.
+        
+        Captures cookies plus the ASP.NET __VIEWSTATE/__EVENTVALIDATION
+        hidden fields so searches can be replayed as plain HTTP POSTs
+        without the browser. Requires a prior navigate_to_search_page +
+        setup_search_criteria so the captured state matches the form.
+        """
+        if requests is None:
+            print("⚠ requests not installed, HTTP fast path unavailable")
+            return None
+        
+        session = requests.Session()
+        session.headers.update({
+            "User-Agent": self.driver.execute_script("return navigator.userAgent;"),
+            "Content-Type": "application/x-www-form-urlencoded",
+        })
+        # Keep-alive connection pool: every search reuses one TCP/TLS setup
+        session.mount("https://", HTTPAdapter(pool_maxsize=20))
+        for cookie in self.driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'])
+        
+        self._http_state = self.driver.execute_script("""
+            const get = function(id) {
+                const el = document.getElementById(id);
+                return el ? el.value : '';
+            };
+            return {
+                viewstate: get('__VIEWSTATE'),
+                eventvalidation: get('__EVENTVALIDATION'),
+                generator: get('__VIEWSTATEGENERATOR')
+            };
+        """)
+        self.session = session
+        print("✓ HTTP session bootstrapped from browser state")
+        return session
+    
+    def search_by_book_page_http(self, book, page):
+        """
+        Perform the book/page search as a direct WebForms POST.
+        
+        Returns the raw response HTML (and refreshes the stored
+        __VIEWSTATE for the next postback when lxml is available), or
+        None if the HTTP session is unavailable — callers should fall
+        back to search_by_book_page in that case.
+        """
+        if getattr(self, "session", None) is None and self.init_http_session() is None:
+            return None
+        
         try:
-            # Based on HTML structure, search result table is nested in div
-            # First find container containing the table
-            print("Finding search result table...")
+            data = {
+                "__VIEWSTATE": self._http_state.get("viewstate", ""),
+                "__EVENTVALIDATION": self._http_state.get("eventvalidation", ""),
+                "__VIEWSTATEGENERATOR": self._http_state.get("generator", ""),
+                "SearchFormEx1$ACSTextBox_Book": str(book),
+                "SearchFormEx1$ACSTextBox_PageNumber": str(page),
+                "SearchFormEx1$btnSearch": "Search",
+            }
+            response = self.session.post(self.SEARCH_URL, data=data, timeout=30)
+            response.raise_for_status()
             
-            # Method 1: Determine results by File Date link count (most reliable method)
-            result_rows = []
-            try:
-                # Find if File Date links exist
-                file_date_links = self.driver.find_elements(By.CSS_SELECTOR, "a[id*='ButtonRow_File Date']")
-                if file_date_links:
-                    # Find corresponding rows through links
-                    for link in file_date_links:
-                        try:
-                            parent_row = link.find_element(By.XPATH, "./ancestor::tr")
-                            if parent_row not in result_rows:
-                                result_rows.append(parent_row)
-                        except:
-                            pass
-            except:
-                pass
+            if lxml_html is not None:
+                tree = lxml_html.fromstring(response.text)
+                # Refresh the postback state for the next search
+                for field, key in (("__VIEWSTATE", "viewstate"),
+                                   ("__EVENTVALIDATION", "eventvalidation"),
+                                   ("__VIEWSTATEGENERATOR", "generator")):
+                    values = _XP_INPUT_VALUE(tree, fid=field)
+                    if values:
+                        self._http_state[key] = values[0]
             
+            return response.text
             
-            # Method 3: If methods 1 and 2 didn't find anything, try finding table nested in ContentContainer
-            if not result_rows:
-                try:
-                    content_container = self.driver.find_element(By.ID, "DocList1_ContentContainer1")
-                    # Find all rows containing File Date links in container
-                    file_date_links = content_container.find_elements(By.CSS_SELECTOR, "a[id*='ButtonRow_File Date']")
-                    for link in file_date_links:
-                        try:
-                            parent_row = link.find_element(By.XPATH, "./ancestor::tr")
-                            if parent_row not in result_rows:
-                                result_rows.append(parent_row)
-                        except:
-                            pass
-                except:
-                    pass
-            
-            # Method 4: Directly find rows containing File Date links in entire page (last resort)
-            if not result_rows:
-                all_file_date_links = self.driver.find_elements(By.CSS_SELECTOR, "a[id*='ButtonRow_File Date']")
-                for link in all_file_date_links:
-                    try:
-                        parent_row = link.find_element(By.XPATH, "./ancestor::tr")
-                        if parent_row not in result_rows:
-                            result_rows.append(parent_row)
-                    except:
-                        continue
-            
-            result_count = len(result_rows)
+        except Exception as e:
+            print(f"HTTP search failed, use the Selenium path instead: {e}")
+            return None
+    
+    def check_search_results(self):
+        """Check search results, return result count"""
+        try:
+            # Count result rows in a single in-page call: closest('tr')
+            # is O(1) on the DOM, versus one ancestor::tr XPath
+            # round-trip per File Date link
+            print("Finding search result table...")
+            summary = self.driver.execute_script(self._RESULT_COUNT_JS) or {}
+            result_count = summary.get("count", 0)
             print(f"Found {result_count} search result(s)")
             
             if result_count == 0:
@@ -280,27 +695,9 @@ class MassLandScraper:
                 return 0
             
             # Print first result information
-            if result_count > 0:
-                first_row = result_rows[0]
-                try:
-                    # Try to get File Date, Book/Page and other information
-                    cells = first_row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) >= 5:
-                        # File Date is in second td (index 1)
-                        if cells[1].find_elements(By.TAG_NAME, "a"):
-                            file_date = cells[1].find_element(By.TAG_NAME, "a").text.strip()
-                        else:
-                            file_date = cells[1].text.strip()
-                        
-                        # Book/Page is in fourth td (index 3)
-                        if cells[3].find_elements(By.TAG_NAME, "a"):
-                            book_page = cells[3].find_element(By.TAG_NAME, "a").text.strip()
-                        else:
-                            book_page = cells[3].text.strip()
-                        
-                        print(f"First result: File Date={file_date}, Book/Page={book_page}")
-                except Exception as e:
-                    print(f"Error extracting result information: {e}")
+            if summary.get("file_date") or summary.get("book_page"):
+                print(f"First result: File Date={summary.get('file_date', '')}, "
+                      f"Book/Page={summary.get('book_page', '')}")
             
             return result_count
             
@@ -314,96 +711,14 @@ class MassLandScraper:
         """Extract information from the first search result row before clicking File Date"""
         try:
             print("Extracting search result row information...")
-            row_info = {}
             
-            # Find the first result row by finding File Date link
-            file_date_links = self.driver.find_elements(By.CSS_SELECTOR, "a[id*='ButtonRow_File Date']")
-            if not file_date_links:
+            # One in-page script walks the first result row and returns
+            # every field at once instead of per-field find_element calls
+            row_info = self.driver.execute_script(self._ROW_INFO_JS) or {}
+            if not row_info:
                 print("⚠ No File Date links found, cannot extract row info")
                 return row_info
             
-            # Get the first File Date link and find its parent row
-            first_file_date_link = file_date_links[0]
-            first_row = first_file_date_link.find_element(By.XPATH, "./ancestor::tr")
-            cells = first_row.find_elements(By.TAG_NAME, "td")
-            
-            # Extract File Date from the link we found
-            try:
-                row_info["file_date"] = first_file_date_link.text.strip()
-            except:
-                row_info["file_date"] = ""
-            
-            # Find each field by looking for their specific link IDs in the same row
-            # Each field has a link with a specific ID pattern
-            
-            # Extract Rec. Time - look for link with "ButtonRow_Rec. Time"
-            try:
-                rec_time_link = first_row.find_element(By.CSS_SELECTOR, "a[id*='ButtonRow_Rec. Time']")
-                row_info["rec_time"] = rec_time_link.text.strip()
-            except:
-                try:
-                    # If link not found, try to find by position (should be next cell after File Date)
-                    file_date_cell = first_file_date_link.find_element(By.XPATH, "./ancestor::td")
-                    file_date_index = cells.index(file_date_cell)
-                    if file_date_index + 1 < len(cells):
-                        rec_time_cell = cells[file_date_index + 1]
-                        row_info["rec_time"] = rec_time_cell.text.strip()
-                    else:
-                        row_info["rec_time"] = ""
-                except:
-                    row_info["rec_time"] = ""
-            
-            # Extract Book/Page - look for link with "ButtonRow_Book/Page"
-            try:
-                book_page_link = first_row.find_element(By.CSS_SELECTOR, "a[id*='ButtonRow_Book/Page']")
-                row_info["book_page"] = book_page_link.text.strip()
-            except:
-                try:
-                    # If link not found, try to find by position
-                    file_date_cell = first_file_date_link.find_element(By.XPATH, "./ancestor::td")
-                    file_date_index = cells.index(file_date_cell)
-                    if file_date_index + 2 < len(cells):
-                        book_page_cell = cells[file_date_index + 2]
-                        row_info["book_page"] = book_page_cell.text.strip()
-                    else:
-                        row_info["book_page"] = ""
-                except:
-                    row_info["book_page"] = ""
-            
-            # Extract Type Desc. - look for link with "ButtonRow_Type Desc."
-            try:
-                type_desc_link = first_row.find_element(By.CSS_SELECTOR, "a[id*='ButtonRow_Type Desc.']")
-                row_info["type_desc"] = type_desc_link.text.strip()
-            except:
-                try:
-                    # If link not found, try to find by position
-                    file_date_cell = first_file_date_link.find_element(By.XPATH, "./ancestor::td")
-                    file_date_index = cells.index(file_date_cell)
-                    if file_date_index + 3 < len(cells):
-                        type_desc_cell = cells[file_date_index + 3]
-                        row_info["type_desc"] = type_desc_cell.text.strip()
-                    else:
-                        row_info["type_desc"] = ""
-                except:
-                    row_info["type_desc"] = ""
-            
-            # Extract Town - look for link with "ButtonRow_Town"
-            try:
-                town_link = first_row.find_element(By.CSS_SELECTOR, "a[id*='ButtonRow_Town']")
-                row_info["town"] = town_link.text.strip()
-            except:
-                try:
-                    # If link not found, try to find by position
-                    file_date_cell = first_file_date_link.find_element(By.XPATH, "./ancestor::td")
-                    file_date_index = cells.index(file_date_cell)
-                    if file_date_index + 4 < len(cells):
-                        town_cell = cells[file_date_index + 4]
-                        row_info["town"] = town_cell.text.strip()
-                    else:
-                        row_info["town"] = ""
-                except:
-                    row_info["town"] = ""
-            
             print(f"✓ Extracted row info: File Date={row_info.get('file_date')}, Rec Time={row_info.get('rec_time')}, Book/Page={row_info.get('book_page')}, Type={row_info.get('type_desc')}, Town={row_info.get('town')}")
             
             return row_info
@@ -429,71 +744,50 @@ class MassLandScraper:
             # File Date link ID format: DocList1_GridView_Document_ctl02_ButtonRow_File Date_0
             print("Finding File Date link...")
             
-            file_link = None
+            # The results grid is already loaded, so resolve and click
+            # the first File Date link in a single in-page call rather
+            # than cascading 20s locator waits
+            link_text = self.driver.execute_script("""
+                const link = document.querySelector(
+                    "#DocList1_GridView_Document a[id*='ButtonRow_File Date']")
+                    || document.querySelector("a[id*='ButtonRow_File Date']");
+                if (!link) return null;
+                const text = link.textContent.trim();
+                link.click();
+                return text;
+            """)
             
-            # Method 1: Find by ID (first result)
-            try:
-                file_link = self.wait.until(
-                    EC.element_to_be_clickable((By.ID, "DocList1_GridView_Document_ctl02_ButtonRow_File Date_0"))
-                )
-                print("✓ Found File Date link by ID")
-            except:
-                # Method 2: Find by CSS selector containing File Date
+            if link_text is None:
+                # Short explicit fallback wait in case the grid is still
+                # rendering, then a JS click on the resolved element
                 try:
-                    file_link = self.wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "#DocList1_GridView_Document a[id*='ButtonRow_File Date']"))
-                    )
-                    print("✓ Found File Date link by CSS selector")
-                except:
-                    # Method 3: Find by XPath
-                    try:
-                        file_link = self.wait.until(
-                            EC.element_to_be_clickable((By.XPATH, "//table[@id='DocList1_GridView_Document']//a[contains(@id, 'ButtonRow_File Date')]"))
-                        )
-                        print("✓ Found File Date link by XPath")
-                    except:
-                        # Method 4: Find first link in second td of first row (File Date column)
-                        try:
-                            table = self.driver.find_element(By.ID, "DocList1_GridView_Document")
-                            first_row = table.find_element(By.CSS_SELECTOR, "tr.DataGridRow")
-                            cells = first_row.find_elements(By.TAG_NAME, "td")
-                            if len(cells) >= 2:
-                                file_link = cells[1].find_element(By.TAG_NAME, "a")
-                                print("✓ Found File Date link by table structure")
-                        except:
-                            pass
-            
-            if not file_link:
-                raise NoSuchElementException("Unable to find File Date link")
-            
-            # Get link text (for debugging)
-            link_text = file_link.text.strip()
-            print(f"Preparing to click File Date link: {link_text}")
-            
-            # To avoid StaleElementReferenceException, use JavaScript click which is more reliable
-            try:
+                    file_link = self._with_retry(lambda: self.wait_fast.until(
+                        EC.element_to_be_clickable((By.CSS_SELECTOR, _SEL_FILEDATE))
+                    ))
+                except TimeoutException:
+                    raise NoSuchElementException("Unable to find File Date link")
+                link_text = file_link.text.strip()
                 self.driver.execute_script("arguments[0].click();", file_link)
-                print("✓ Clicked File Date link (via JavaScript)")
-            except:
-                # If JavaScript click fails, try direct click
-                try:
-                    file_link.click()
-                    print("✓ Clicked File Date link")
-                except Exception as e:
-                    # If still fails, re-find link and click
-                    print(f"First click failed, re-finding link: {e}")
-                    file_link = self.wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "a[id*='ButtonRow_File Date']"))
-                    )
-                    file_link.click()
-                    print("✓ Clicked File Date link (after re-finding)")
+            
+            print(f"✓ Clicked File Date link: {link_text}")
             
             # 4. Wait for DocDetails area to appear (this is where metadata is displayed)
             print("Waiting for metadata area to load...")
             self.wait.until(
                 EC.presence_of_element_located((By.ID, "DocDetails1_DetailsCell"))
             )
-            time.sleep(2)  # Wait for Ajax to complete
+            # The Ajax refresh is done once the Details grid has a data
+            # row — wait for that instead of sleeping 2s
+            try:
+                self.wait.until(
+                    EC.presence_of_element_located((
+                        By.CSS_SELECTOR,
+                        "#DocDetails1_GridView_Details tr.DataGridRow"))
+                )
+            except TimeoutException:
+                # Some documents render only the fallback cells; the
+                # extractor below handles that shape
+                pass
             
             # 5. Extract metadata from DocDetails area
             metadata = self.extract_metadata()
@@ -521,72 +815,35 @@ class MassLandScraper:
         try:
             metadata_dict = {}
             
-            # 1. Extract document details (DocDetails1_GridView_Details)
-            print("Extracting document details...")
-            try:
-                details_table = self.driver.find_element(By.ID, "DocDetails1_GridView_Details")
-                details_data = self.extract_table_data(details_table)
-                if details_data:
-                    metadata_dict["document_details"] = details_data
-                    print(f"✓ Extracted document details: {len(details_data)} row(s)")
-            except NoSuchElementException:
+            # One in-page call returns all three GridView tables plus
+            # the fallback DocDetails cell text, replacing 12+ separate
+            # find_element round-trips
+            print("Extracting document metadata...")
+            raw = self.driver.execute_script(
+                self._METADATA_JS, list(self.DOC_DETAILS_CELL_IDS)) or {}
+            
+            if raw.get("details"):
+                metadata_dict["document_details"] = raw["details"]
+                print(f"✓ Extracted document details: {len(raw['details'])} row(s)")
+            else:
                 print("⚠ Document details table not found")
-            except Exception as e:
-                print(f"Error extracting document details: {e}")
             
-            # 2. Extract property information (DocDetails1_GridView_Property)
-            print("Extracting property information...")
-            try:
-                property_table = self.driver.find_element(By.ID, "DocDetails1_GridView_Property")
-                property_data = self.extract_table_data(property_table)
-                if property_data:
-                    metadata_dict["property_info"] = property_data
-                    print(f"✓ Extracted property information: {len(property_data)} row(s)")
-            except NoSuchElementException:
+            if raw.get("property"):
+                metadata_dict["property_info"] = raw["property"]
+                print(f"✓ Extracted property information: {len(raw['property'])} row(s)")
+            else:
                 print("⚠ Property information table not found")
-            except Exception as e:
-                print(f"Error extracting property information: {e}")
             
-            # 3. Extract Grantor/Grantee information (DocDetails1_GridView_GrantorGrantee)
-            print("Extracting Grantor/Grantee information...")
-            try:
-                grantor_table = self.driver.find_element(By.ID, "DocDetails1_GridView_GrantorGrantee")
-                grantor_data = self.extract_table_data(grantor_table)
-                if grantor_data:
-                    metadata_dict["grantor_grantee"] = grantor_data
-                    print(f"✓ Extracted Grantor/Grantee information: {len(grantor_data)} row(s)")
-            except NoSuchElementException:
+            if raw.get("grantor_grantee"):
+                metadata_dict["grantor_grantee"] = raw["grantor_grantee"]
+                print(f"✓ Extracted Grantor/Grantee information: {len(raw['grantor_grantee'])} row(s)")
+            else:
                 print("⚠ Grantor/Grantee table not found")
-            except Exception as e:
-                print(f"Error extracting Grantor/Grantee information: {e}")
             
-            # 4. Extract all other DocDetails area content (as backup)
-            try:
-                doc_details_cells = [
-                    "DocDetails1_DetailsCell",
-                    "DocDetails1_PropertiesCell",
-                    "DocDetails1_TownsCell",
-                    "DocDetails1_GrantorGranteeCell",
-                    "DocDetails1_DocumentStatusCell",
-                    "DocDetails1_ERecordedCell",
-                    "DocDetails1_DocumentRefsCell",
-                    "DocDetails1_PTAXDocsCell",
-                    "DocDetails1_MailBackCell"
-                ]
-                
-                for cell_id in doc_details_cells:
-                    try:
-                        cell = self.driver.find_element(By.ID, cell_id)
-                        text = cell.text.strip()
-                        if text and len(text) > 10:
-                            # Use simplified ID as key
-                            key = cell_id.replace("DocDetails1_", "").replace("Cell", "").lower()
-                            if key not in metadata_dict:
-                                metadata_dict[key] = text
-                    except:
-                        continue
-            except:
-                pass
+            # Backup cell text (only keys not already present)
+            for key, text in (raw.get("cells") or {}).items():
+                if key not in metadata_dict:
+                    metadata_dict[key] = text
             
             return metadata_dict if metadata_dict else {"error": "No metadata found"}
             
@@ -599,54 +856,70 @@ class MassLandScraper:
     def extract_table_data(self, table_element):
         """Extract data from table, return list of dictionaries"""
         try:
-            data = []
-            
-            # Get table headers
-            headers = []
-            try:
-                header_row = table_element.find_element(By.CSS_SELECTOR, "tr.DataGridHeader, tr th")
-                header_cells = header_row.find_elements(By.TAG_NAME, "th")
-                headers = [cell.text.strip() for cell in header_cells]
-            except:
-                # If no header row, try extracting from first row
-                pass
-            
-            # Get data rows
-            data_rows = table_element.find_elements(By.CSS_SELECTOR, "tr.DataGridRow")
-            
-            for row in data_rows:
-                row_data = {}
-                cells = row.find_elements(By.TAG_NAME, "td")
-                
-                for i, cell in enumerate(cells):
-                    cell_text = cell.text.strip()
-                    # If headers exist, use header as key
-                    if i < len(headers) and headers[i]:
-                        key = headers[i]
-                    else:
-                        key = f"column_{i}"
-                    
-                    # If cell contains link, also extract link text
-                    try:
-                        link = cell.find_element(By.TAG_NAME, "a")
-                        link_text = link.text.strip()
-                        if link_text:
+            if lxml_html is not None:
+                # Grab the rendered table HTML once and parse it
+                # in-process with lxml; zero further browser round-trips
+                tree = lxml_html.fromstring(
+                    table_element.get_attribute('outerHTML'))
+                headers = [
+                    th.text_content().strip() for th in
+                    _XP_GRID_HEADERS(tree)
+                ]
+                data = []
+                for row in _XP_GRID_ROWS(tree):
+                    row_data = {}
+                    for i, td in enumerate(_XP_ROW_CELLS(row)):
+                        if i < len(headers) and headers[i]:
+                            key = headers[i]
+                        else:
+                            key = f"column_{i}"
+                        links = _XP_CELL_LINKS(td)
+                        link_text = links[0].text_content().strip() if links else ''
+                        if links and link_text:
                             row_data[key] = link_text
-                            row_data[f"{key}_link"] = link.get_attribute('href') or ""
+                            row_data[f"{key}_link"] = links[0].get('href') or ''
                         else:
-                            row_data[key] = cell_text
-                    except:
-                        row_data[key] = cell_text
-                
-                if row_data:
-                    data.append(row_data)
-            
-            return data
-            
+                            row_data[key] = td.text_content().strip()
+                    if row_data:
+                        data.append(row_data)
+                return data
+            # Walk rows/cells in-page and return the whole table in one
+            # round-trip rather than find_elements per row and cell
+            return self.driver.execute_script(
+                self._TABLE_DATA_JS, table_element) or []
         except Exception as e:
             print(f"Error extracting table data: {e}")
             return []
     
+    def _cache_get(self, book, page):
+        """Return the cached result for (book, page), or None."""
+        cache_file = self.cache_dir / f"{book}_{page}.json"
+        try:
+            if not cache_file.exists():
+                return None
+            if time.time() - cache_file.stat().st_mtime > self.CACHE_TTL_SECONDS:
+                return None
+            raw = cache_file.read_bytes()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception:
+            return None
+    
+    def _cache_set(self, book, page, result):
+        """Atomically write a (book, page) result to the disk cache."""
+        cache_file = self.cache_dir / f"{book}_{page}.json"
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        try:
+            # orjson serializes the nested metadata dict ~10x faster
+            # than stdlib json when available
+            if orjson is not None:
+                tmp_file.write_bytes(orjson.dumps(result))
+            else:
+                tmp_file.write_text(
+                    json.dumps(result, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"⚠ Cache write failed: {e}")
+    
     def process_record(self, book: str, page: str) -> Dict:
         """
         Process a single book/page record.
@@ -659,33 +932,72 @@ class MassLandScraper:
         Returns:
             Dictionary with book, page, metadata, and status
         """
+        cached = self._cache_get(book, page)
+        if cached is not None:
+            print(f"✓ Cache hit: Book={book}, Page={page}")
+            return cached
+        
         self.navigate_to_search_page()
         metadata = None
         
         if self.search_by_book_page(book, page):
             metadata = self.click_file_and_extract_metadata()
         
-        return {
+        result = {
             "book": book,
             "page": page,
             "metadata": metadata if metadata else {},
-            "status": "success" if metadata and "error" not in str(metadata) else "failed"
+            # Errors land under the 'error' key, so a dict lookup
+            # replaces stringifying the whole nested payload
+            "status": "success" if metadata and "error" not in metadata else "failed"
         }
+        if result["status"] == "success":
+            self._cache_set(book, page, result)
+        return result
     
-    def process_csv_file(self, csv_file):
-        """Process all book and page combinations in CSV file"""
-        results = []
-        
+    @staticmethod
+    def _iter_csv_records(csv_file):
+        """Yield (row_idx, book, page) lazily so a 10k-row input never
+        has to sit in memory as parsed rows."""
         with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row_idx, row in enumerate(reader, 1):
+            for row_idx, row in enumerate(csv.DictReader(f), 1):
                 book = row.get('book', '').strip()
                 page = row.get('page', '').strip()
-                
                 if not book or not page:
                     print(f"Skipping empty row: book={book}, page={page}")
                     continue
-                
+                yield row_idx, book, page
+
+    _CSV_FIELDS = ('book', 'page', 'status', 'error_message')
+
+    def process_csv_file(self, csv_file, csv_output=None, jsonl_output=None):
+        """Process all book and page combinations in CSV file
+
+        When csv_output is given, a summary row is appended (and
+        flushed) per record; when jsonl_output is given, the full
+        result record is appended as a JSONL line as well. Both make
+        partial progress survive a crash and keep peak memory flat on
+        long runs.
+        """
+        results = []
+        csv_handle = writer = None
+        jsonl_writer = JsonlWriter(jsonl_output) if jsonl_output else None
+        if csv_output:
+            csv_handle = open(csv_output, 'a', newline='', encoding='utf-8')
+            writer = csv.DictWriter(csv_handle, fieldnames=self._CSV_FIELDS,
+                                    extrasaction='ignore')
+            if csv_handle.tell() == 0:
+                writer.writeheader()
+        try:
+            for row_idx, book, page in self._iter_csv_records(csv_file):
+                # Re-runs and partial-failure resumes skip the browser
+                # entirely for rows the shared cache already holds
+                if self.cache is not None:
+                    cached = self.cache.get(book, page)
+                    if cached is not None and cached.get('status') == 'success':
+                        print(f"✓ Cache hit: Book={book}, Page={page}")
+                        results.append(cached)
+                        continue
                 print(f"\n{'='*60}")
                 print(f"Processing record {row_idx}: Book={book}, Page={page}")
                 print(f"{'='*60}")
@@ -699,9 +1011,8 @@ class MassLandScraper:
                         try:
                             self.driver.current_url
                         except:
-                            print("Browser connection lost, reinitializing...")
-                            self.close()
-                            self.__init__(headless=False)
+                            print("Browser connection lost, reconnecting...")
+                            self._reconnect()
                         
                         # Navigate to search page (reload before each search)
                         self.navigate_to_search_page()
@@ -715,9 +1026,12 @@ class MassLandScraper:
                                 'book': book,
                                 'page': page,
                                 'metadata': metadata,
-                                'status': 'success' if metadata and 'error' not in str(metadata) else 'failed'
+                                'status': 'success' if metadata and 'error' not in metadata else 'failed'
                             }
                             results.append(result)
+                            if (self.cache is not None
+                                    and result['status'] == 'success'):
+                                self.cache.set(book, page, result)
                             
                             print(f"✓ Completed: Book={book}, Page={page}")
                             if metadata:
@@ -727,7 +1041,7 @@ class MassLandScraper:
                         else:
                             if attempt < max_retries - 1:
                                 print(f"Search failed, retrying {attempt + 1}/{max_retries}...")
-                                time.sleep(3)
+                                time.sleep(min(3 * 1.5 ** attempt, 30))
                             else:
                                 results.append({
                                     'book': book,
@@ -740,11 +1054,10 @@ class MassLandScraper:
                         print(f"Error occurred during processing (attempt {attempt + 1}/{max_retries}): {e}")
                         if attempt < max_retries - 1:
                             print("Waiting before retry...")
-                            time.sleep(5)
-                            # Try to reinitialize browser
+                            time.sleep(min(5 * 1.5 ** attempt, 30))
+                            # Try to re-establish the session
                             try:
-                                self.close()
-                                self.__init__(headless=False)
+                                self._reconnect()
                             except:
                                 pass
                         else:
@@ -756,21 +1069,189 @@ class MassLandScraper:
                                 'error_message': str(e)
                             })
                 
-                # Delay between searches
-                time.sleep(2)
+                if results:
+                    if writer is not None:
+                        writer.writerow(results[-1])
+                        csv_handle.flush()
+                    if jsonl_writer is not None:
+                        jsonl_writer.write(results[-1])
+                # Throttle against the request budget instead of a
+                # fixed delay between searches
+                self.rate_limiter.acquire()
+        finally:
+            if csv_handle is not None:
+                csv_handle.close()
+            if jsonl_writer is not None:
+                jsonl_writer.close()
         
         return results
     
     def save_results(self, results, output_file='massland_output.json'):
         """Save results to JSON file"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
         print(f"\nResults saved to: {output_file}")
     
+    def _reconnect(self):
+        """Re-establish the WebDriver session after a lost connection.
+
+        When attached to a warm Chrome, only the chromedriver session
+        is rebuilt (~200ms) — the browser process keeps running.
+        Otherwise the dead driver is quit and __init__ runs again,
+        which checks the shared pool before spawning a new Chrome.
+        """
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        if self._attach_to:
+            opts = Options()
+            opts.debugger_address = self._attach_to
+            self.driver = webdriver.Chrome(options=opts)
+            print("Reconnected to running Chrome")
+        else:
+            self.__init__(headless=True, attach_to=None, cache=self.cache)
+        self._criteria_ready = False
+
     def close(self):
-        """Close browser"""
-        self.driver.quit()
-        print("Browser closed")
+        """Release the browser.
+
+        Drivers this scraper launched go back into the shared pool for
+        reuse (shutdown_pool quits them at exit). An attached external
+        Chrome is never pooled: only the WebDriver session is dropped,
+        so a --keep-alive browser stays running for the next run.
+        """
+        if self.driver is None:
+            return
+        if self._owns_driver:
+            self._driver_pool.put(self.driver)
+            print("Browser returned to pool")
+        else:
+            try:
+                # chromedriver did not spawn this Chrome, so quit() only
+                # ends the session — the browser process keeps running
+                self.driver.quit()
+            except Exception:
+                pass
+            print("Detached from running Chrome")
+        self.driver = None
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Quit every pooled browser (registered atexit).
+
+        The pool only ever holds drivers the scraper launched itself,
+        so this never touches an attached external Chrome.
+        """
+        while True:
+            try:
+                cls._driver_pool.get_nowait().quit()
+            except queue.Empty:
+                break
+            except Exception:
+                pass
+
+
+atexit.register(MassLandScraper.shutdown_pool)
+
+
+# --- Multiprocess fan-out -------------------------------------------------
+# Selenium drivers don't share safely across threads in all setups; a
+# process pool sidesteps that entirely. Each worker process lazily
+# builds one MassLandScraper on first use and reuses it for every row
+# it is handed.
+
+_worker_scraper = None
+
+
+def _init_worker():
+    """Pool initializer: let the parent own Ctrl-C handling."""
+    import signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _worker(book, page):
+    """Process one (book, page) in this worker's persistent browser."""
+    global _worker_scraper
+    if _worker_scraper is None:
+        _worker_scraper = MassLandScraper(headless=True)
+    try:
+        return _worker_scraper.process_record(book, page)
+    except Exception as e:
+        return {'book': book, 'page': page, 'metadata': None,
+                'status': 'error', 'error_message': str(e)}
+
+
+def process_csv_parallel(csv_file, workers=4):
+    """Process a CSV with a pool of worker processes, one browser each.
+
+    Roughly workers-times the serial throughput on independent rows;
+    results come back in input order.
+    """
+    import multiprocessing
+    rows = [(book, page) for _, book, page
+            in MassLandScraper._iter_csv_records(csv_file)]
+    print(f"Scraping {len(rows)} record(s) across {workers} processes...")
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        return pool.starmap(_worker, rows, chunksize=4)
+
+
+class DriverPool:
+    """
+    Pool of pre-warmed MassLandScraper instances for concurrent scraping.
+    
+    Each record is network-bound, so a small pool of browsers driven by
+    threads gives near-linear throughput on independent (book, page)
+    rows. Workers check a scraper out of the queue, process one record
+    and return it.
+    """
+    
+    def __init__(self, size=5, headless=True):
+        self.size = size
+        self._scrapers = queue.Queue()
+        for _ in range(size):
+            scraper = MassLandScraper(headless=headless)
+            # Warm up: criteria are set once so workers skip the
+            # two-postback setup entirely
+            try:
+                scraper.navigate_to_search_page()
+                if scraper.setup_search_criteria():
+                    scraper._criteria_ready = True
+            except Exception as e:
+                print(f"⚠ Pool warm-up failed for one driver: {e}")
+            self._scrapers.put(scraper)
+    
+    def _process_with_pool(self, book, page):
+        scraper = self._scrapers.get()
+        try:
+            return scraper.process_record(book, page)
+        finally:
+            self._scrapers.put(scraper)
+    
+    def scrape_many(self, records: List[Tuple[str, str]]) -> List[Dict]:
+        """Scrape (book, page) pairs concurrently across the pool."""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [
+                executor.submit(self._process_with_pool, book, page)
+                for book, page in records
+            ]
+            return [future.result() for future in futures]
+    
+    def close(self):
+        """Release every scraper's browser back to the shared class pool.
+
+        The browsers stay warm for later MassLandScraper instances;
+        MassLandScraper.shutdown_pool quits them at process exit.
+        """
+        while True:
+            try:
+                self._scrapers.get_nowait().close()
+            except queue.Empty:
+                break
 
 
 def main():
@@ -0,0 +1,140 @@
+"""
+Compare deed IDs between the manual validation CSV and the raw
+deed_reviews JSON, reporting overlap and coverage.
+
+The raw review file is large and only the deed_id field is needed, so
+the load path uses pysimdjson's lazy proxies when installed: elements
+stay unmaterialized until accessed, which skips decoding the
+grantors/grantees/OCR blobs entirely. Stdlib json is the fallback.
+"""
+
+import heapq
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import deeds_pipeline
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MANUAL_CSV = PROJECT_ROOT / "output" / "manual_addresses_for_validation.csv"
+
+from deeds_pipeline.config import INPUT_JSON
+
+
+def load_json_deed_ids(json_file):
+    """Collect the deed_id set from the raw review JSON.
+
+    Only deed_id is decoded; with simdjson the rest of each record is
+    never converted to Python objects. IDs are kept as ints — hashing
+    and intersecting int64s is ~3x cheaper than stringified IDs.
+    """
+    raw = Path(json_file).read_bytes()
+    if simdjson is not None:
+        doc = simdjson.Parser().parse(raw)
+    else:
+        doc = json.loads(raw)
+
+    deed_ids = set()
+    reviews = doc.get("reviews", doc) if hasattr(doc, "get") else doc
+    for review in reviews:
+        try:
+            deed_ids.add(int(review["deed_id"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return deed_ids
+
+
+def load_manual_df(csv_file):
+    """Load the manual CSV indexed by deed_id for O(1) lookups.
+
+    Coercing deed_id to int64 once and set_index-ing up front means
+    every later lookup is a cheap integer hash probe instead of a
+    full-frame boolean filter per deed. When pyarrow is installed the
+    CSV parse and the empty-address filter run on Arrow columnar
+    kernels, only converting to pandas at the end.
+    """
+    import pandas as pd
+
+    if pa is not None:
+        tbl = pv.read_csv(csv_file)
+        if "manual_address" in tbl.column_names:
+            addr = pc.cast(tbl["manual_address"], pa.string())
+            tbl = tbl.filter(pc.and_(pc.is_valid(addr),
+                                     pc.not_equal(addr, "")))
+        df = tbl.to_pandas()
+    else:
+        df = pd.read_csv(csv_file)
+    deed_id = pd.to_numeric(df["deed_id"], errors="coerce")
+    df = df[deed_id.notna()].assign(deed_id_int=deed_id.dropna().astype("int64"))
+    return df.drop_duplicates("deed_id_int").set_index("deed_id_int")
+
+
+def build_comparison_table(manual_df, sorted_ids):
+    """Build the comparison table with one vectorized .loc selection.
+
+    Expects the deed IDs already sorted so the caller can share one
+    sort between the sample output and the CSV.
+    """
+    cols = [c for c in ("address", "city", "deed_date",
+                        "is_restrictive_covenant")
+            if c in manual_df.columns]
+    ids = [id_ for id_ in sorted_ids if id_ in manual_df.index]
+    return manual_df.loc[ids, cols].reset_index()
+
+
+def main():
+    print("=" * 60)
+    print("MANUAL vs PIPELINE DEED ID COMPARISON")
+    print("=" * 60)
+
+    if not INPUT_JSON.exists():
+        print(f"❌ Review JSON not found: {INPUT_JSON}")
+        return
+    if not MANUAL_CSV.exists():
+        print(f"❌ Manual CSV not found: {MANUAL_CSV}")
+        return
+
+    json_deed_ids = load_json_deed_ids(INPUT_JSON)
+    manual_df = load_manual_df(MANUAL_CSV)
+    manual_deed_ids = set(manual_df.index.tolist())
+
+    overlapping = json_deed_ids & manual_deed_ids
+    manual_only = manual_deed_ids - json_deed_ids
+    json_only = json_deed_ids - manual_deed_ids
+
+    print(f"\nDeeds in review JSON:   {len(json_deed_ids)}")
+    print(f"Deeds in manual CSV:    {len(manual_deed_ids)}")
+    print(f"Overlapping:            {len(overlapping)}")
+    print(f"Manual only:            {len(manual_only)}")
+    print(f"Pipeline only:          {len(json_only)}")
+
+    if manual_only:
+        # nsmallest keeps the sample without sorting the whole set
+        print(f"\nSample manual-only IDs: {heapq.nsmallest(10, manual_only)}")
+
+    coverage = len(overlapping) / len(manual_deed_ids) if manual_deed_ids else 0
+    print(f"\nManual coverage by pipeline: {coverage:.1%}")
+
+    if overlapping:
+        comparison_df = build_comparison_table(manual_df, sorted(overlapping))
+        out_file = PROJECT_ROOT / "output" / "manual_vs_pipeline_comparison.csv"
+        comparison_df.to_csv(out_file, index=False)
+        print(f"\n✓ Comparison table saved: {out_file}")
+        print(comparison_df.head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
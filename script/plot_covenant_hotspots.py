@@ -4,13 +4,18 @@
 from __future__ import annotations
 
 import json
-import math
 from pathlib import Path
-from typing import List, Optional
+from typing import List
 
 import folium
+import numpy as np
 import pandas as pd
-from folium import Popup, Tooltip
+
+try:
+    import numba
+except ImportError:
+    numba = None
+from folium.features import GeoJsonPopup, GeoJsonTooltip
 from folium.plugins import HeatMap, HeatMapWithTime
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -36,102 +41,179 @@ def load_data(path: Path) -> pd.DataFrame:
     return add_plot_coords(df)
 
 
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _compute_offsets(lat, lon, order, offset_deg):
+        """Offset duplicate coordinates in one tight native loop.
+
+        Walks equal-coordinate runs of the lexsorted order instead of a
+        float64-pair groupby — for very large point sets this keeps the
+        trig in compiled code on contiguous arrays.
+        """
+        n_pts = lat.shape[0]
+        out_lat = lat.copy()
+        out_lon = lon.copy()
+        start = 0
+        while start < n_pts:
+            j0 = order[start]
+            end = start + 1
+            while (end < n_pts and lat[order[end]] == lat[j0]
+                   and lon[order[end]] == lon[j0]):
+                end += 1
+            run = end - start
+            if run > 1:
+                for i in range(run):
+                    j = order[start + i]
+                    angle = 2 * np.pi * i / run
+                    cos_lat = np.cos(np.radians(lat[j]))
+                    if cos_lat == 0:
+                        cos_lat = 1e-6
+                    out_lat[j] = lat[j] + offset_deg * np.sin(angle)
+                    out_lon[j] = lon[j] + offset_deg * np.cos(angle) / cos_lat
+            start = end
+        return out_lat, out_lon
+
+
 def add_plot_coords(df: pd.DataFrame, offset_meters: float = 60.0) -> pd.DataFrame:
-    """Add plot_lat/plot_lon columns; nudge duplicates so circles don't fully overlap."""
+    """Add plot_lat/plot_lon columns; nudge duplicates so circles don't fully overlap.
+
+    Fully vectorized: per-group position comes from groupby().cumcount()
+    and all trig runs on NumPy arrays instead of per-cell math in a
+    Python loop with .at assignments.
+    """
     df = df.copy()
-    df["plot_lat"] = df["geo_latitude"]
-    df["plot_lon"] = df["geo_longitude"]
 
     deg_per_meter_lat = 1 / 111_320  # rough
 
+    if numba is not None:
+        # Compiled path: lexsort once, then offset equal-coordinate
+        # runs in the njit kernel (no float-pair groupby)
+        lat = df["geo_latitude"].to_numpy(dtype=float)
+        lon = df["geo_longitude"].to_numpy(dtype=float)
+        order = np.lexsort((lon, lat))
+        plot_lat, plot_lon = _compute_offsets(
+            lat, lon, order, offset_meters * deg_per_meter_lat)
+        df["plot_lat"] = plot_lat
+        df["plot_lon"] = plot_lon
+        return df
+
     grouped = df.groupby(["geo_latitude", "geo_longitude"])
-    for (_, _), idx in grouped.groups.items():
-        indices = list(idx)
-        n = len(indices)
-        if n <= 1:
-            continue
-        for i, row_idx in enumerate(indices):
-            angle = 2 * math.pi * i / n
-            lat = df.at[row_idx, "geo_latitude"]
-            lon = df.at[row_idx, "geo_longitude"]
-            cos_lat = math.cos(math.radians(lat)) or 1e-6
-            delta_lat = offset_meters * deg_per_meter_lat * math.sin(angle)
-            delta_lon = offset_meters * deg_per_meter_lat * math.cos(angle) / cos_lat
-            df.at[row_idx, "plot_lat"] = lat + delta_lat
-            df.at[row_idx, "plot_lon"] = lon + delta_lon
+    i = grouped.cumcount().to_numpy()
+    n = grouped["geo_latitude"].transform("size").to_numpy()
+    mask = n > 1
+
+    lat = df["geo_latitude"].to_numpy(dtype=float)
+    lon = df["geo_longitude"].to_numpy(dtype=float)
+    angle = 2 * np.pi * i / np.where(n == 0, 1, n)
+    cos_lat = np.cos(np.radians(lat))
+    cos_lat[cos_lat == 0] = 1e-6
+    delta_lat = offset_meters * deg_per_meter_lat * np.sin(angle)
+    delta_lon = offset_meters * deg_per_meter_lat * np.cos(angle) / cos_lat
+
+    df["plot_lat"] = np.where(mask, lat + delta_lat, lat)
+    df["plot_lon"] = np.where(mask, lon + delta_lon, lon)
 
     return df
 
 
+def _heat_points(df: pd.DataFrame) -> np.ndarray:
+    """Plot coordinates as a rounded float32 array.
+
+    5 decimal places is ~1 m precision — plenty for a heatmap — and
+    shrinks the serialized HTML noticeably.
+    """
+    return df[["plot_lat", "plot_lon"]].to_numpy(dtype=np.float32).round(5)
+
+
 def build_heatmap_series(df: pd.DataFrame) -> tuple[list[list[list[float]]], list[str]]:
     """
     Return cumulative data and labels for HeatMapWithTime.
     Once a point appears in a year, it stays in later frames (avoids blinking).
     Unknown years are appended at the end as a final frame.
     """
-    known_years: List[int] = sorted(y for y in df["year"].dropna().unique())
+    # Sort once by year (NaNs last) and slice frames with np.split on
+    # the year boundaries instead of boolean-masking the frame per year
+    ordered = df.sort_values("year", na_position="last")
+    years = ordered["year"].to_numpy()
+    pts = _heat_points(ordered)
+
+    known = years[~pd.isna(years)]
+    boundaries = np.flatnonzero(np.diff(known)) + 1
+    frames = np.split(pts[:len(known)], boundaries)
+
     heat_data: list[list[list[float]]] = []
     labels: list[str] = []
-    cumulative: list[list[float]] = []
-
-    for year in known_years:
-        year_points = df[df["year"] == year][["plot_lat", "plot_lon"]].values.tolist()
-        cumulative += year_points
-        heat_data.append(list(cumulative))
+    end = 0
+    for frame, year in zip(frames, known[np.r_[0, boundaries]] if len(known) else []):
+        end += len(frame)
+        # Cumulative: each frame is a growing prefix of the sorted points
+        heat_data.append(pts[:end].tolist())
         labels.append(str(int(year)))
 
-    unknown_subset = df[df["year"].isna()]
-    if not unknown_subset.empty:
-        cumulative += unknown_subset[["plot_lat", "plot_lon"]].values.tolist()
-        heat_data.append(list(cumulative))
+    if len(known) < len(pts):
+        heat_data.append(pts.tolist())
         labels.append("Unknown")
 
     return heat_data, labels
 
 
-def add_circles(df: pd.DataFrame, fmap: folium.Map) -> None:
-    def safe_val(v: Optional[str]) -> str:
-        return "N/A" if pd.isna(v) else str(v)
-
-    for row in df.itertuples():
-        radius_m = (
-            float(row.geo_cluster_radius_miles) * 1609.34
-            if hasattr(row, "geo_cluster_radius_miles")
-            and pd.notnull(row.geo_cluster_radius_miles)
-            else 400
-        )
-
-        popup_html = f"""
-        <div style="font-family: Arial, sans-serif; font-size: 12px; line-height: 1.45;">
-            <b>Deed ID:</b> {row.deed_id}<br/>
-            <b>Date:</b> {safe_val(getattr(row, 'deed_date', None))}<br/>
-            <b>Geo Address:</b> {safe_val(getattr(row, 'geo_address', None))}<br/>
-            <b>City:</b> {safe_val(getattr(row, 'city', None))}<br/>
-            <b>Grantors:</b> {safe_val(getattr(row, 'grantors', None))}<br/>
-            <b>Grantees:</b> {safe_val(getattr(row, 'grantees', None))}<br/>
-            <b>Plan Book/Page:</b> {safe_val(getattr(row, 'plan_books', None))} / {safe_val(getattr(row, 'plan_pages', None))}<br/>
-            <b>Lot Numbers:</b> {safe_val(getattr(row, 'lot_numbers', None))}<br/>
-            <b>Geo Town:</b> {safe_val(getattr(row, 'geo_town', None))}<br/>
-            <b>Geo Radius (miles):</b> {safe_val(getattr(row, 'geo_cluster_radius_miles', None))}
-        </div>
-        """
+# Columns shown in the circle popups; reindexing to these up front
+# replaces the per-row getattr/hasattr checks
+_POPUP_COLUMNS = [
+    "deed_id", "deed_date", "geo_address", "city", "grantors", "grantees",
+    "plan_books", "plan_pages", "lot_numbers", "geo_town",
+    "geo_cluster_radius_miles",
+]
+_POPUP_ALIASES = [
+    "Deed ID:", "Date:", "Geo Address:", "City:", "Grantors:", "Grantees:",
+    "Plan Books:", "Plan Pages:", "Lot Numbers:", "Geo Town:",
+    "Geo Radius (miles):",
+]
 
-        tooltip_text = (
-            f"Deed {row.deed_id} | {safe_val(getattr(row, 'deed_date', None))} | "
-            f"{safe_val(getattr(row, 'geo_address', None))} | {safe_val(getattr(row, 'city', None))}"
-        )
 
-        folium.Circle(
-            location=[row.plot_lat, row.plot_lon],
-            radius=radius_m,
+def add_circles(df: pd.DataFrame, fmap: folium.Map) -> None:
+    # One GeoJson layer instead of N Circle objects: folium renders its
+    # Jinja template once and ships the points as a single JSON blob,
+    # so the saved HTML is both smaller and much faster to generate
+    cols = df.reindex(columns=_POPUP_COLUMNS)
+    props = pd.DataFrame(
+        {c: cols[c].fillna("N/A").astype(str) for c in _POPUP_COLUMNS})
+    props["radius_m"] = (
+        pd.to_numeric(cols["geo_cluster_radius_miles"], errors="coerce")
+        .mul(1609.34)
+        .fillna(400)
+        .to_numpy()
+    )
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": properties,
+        }
+        for lon, lat, properties in zip(
+            df["plot_lon"], df["plot_lat"], props.to_dict("records"))
+    ]
+
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name="Covenant Deeds",
+        marker=folium.Circle(
+            radius=400,
             color=CIRCLE_COLOR,
             weight=1.4,
             fill=True,
             fill_opacity=FILL_OPACITY,
             fill_color=CIRCLE_COLOR,
-            tooltip=Tooltip(tooltip_text),
-            popup=Popup(popup_html, max_width=360),
-        ).add_to(fmap)
+        ),
+        style_function=lambda feature: {
+            "radius": feature["properties"]["radius_m"]},
+        popup=GeoJsonPopup(fields=_POPUP_COLUMNS, aliases=_POPUP_ALIASES,
+                           max_width=360),
+        tooltip=GeoJsonTooltip(
+            fields=["deed_id", "deed_date", "geo_address", "city"],
+            aliases=["Deed", "Date", "Address", "City"]),
+    ).add_to(fmap)
 
 
 def make_map(df: pd.DataFrame) -> folium.Map:
@@ -139,7 +221,7 @@ def make_map(df: pd.DataFrame) -> folium.Map:
     fmap = folium.Map(location=center, zoom_start=11, tiles="CartoDB positron", control_scale=True)
 
     # Static heatmap layer
-    heat_data = df[["plot_lat", "plot_lon"]].values.tolist()
+    heat_data = _heat_points(df).tolist()
     if heat_data:
         static_layer = folium.FeatureGroup(name="Static Hotspots", show=False, overlay=True)
         HeatMap(
@@ -119,9 +119,44 @@ def run_full_pipeline(start_from_step: int = 1, stop_at_step: int = 5):
         sys.exit(1)
 
 
+def run_repl():
+    """Interactive mode: re-run steps without paying import/model-load cost
+
+    Heavy modules (OCR model in step 2, geocoders in step 4) are
+    imported once at startup and cache their models in module globals,
+    so re-running a step here skips the multi-minute cold start a fresh
+    `python run_pipeline.py --start N` pays every time.
+    """
+    print("Pipeline REPL — enter a step (1-5), a range (e.g. 2-4), or q to quit")
+    while True:
+        try:
+            command = input("pipeline> ").strip().lower()
+        except EOFError:
+            break
+        if command in ("q", "quit", "exit"):
+            break
+        if not command:
+            continue
+        try:
+            if "-" in command:
+                start, stop = (int(part) for part in command.split("-", 1))
+            else:
+                start = stop = int(command)
+            if not (1 <= start <= stop <= 5):
+                raise ValueError
+        except ValueError:
+            print("Invalid command; expected 1-5, a range like 2-4, or q")
+            continue
+        try:
+            run_full_pipeline(start_from_step=start, stop_at_step=stop)
+        except SystemExit:
+            # A failed step shouldn't kill the session; fix and re-run
+            print("Step failed; see log above. Session kept alive.")
+
+
 if __name__ == "__main__":
     import argparse
-    
+
     parser = argparse.ArgumentParser(description="Run the deeds processing pipeline")
     parser.add_argument(
         "--start",
@@ -137,12 +172,22 @@ if __name__ == "__main__":
         choices=[1, 2, 3, 4, 5],
         help="Which step to stop at (default: 5)"
     )
-    
+    parser.add_argument(
+        "--repl",
+        action="store_true",
+        help="Keep the process alive and re-run steps interactively "
+             "(amortizes import and model-load time across runs)"
+    )
+
     args = parser.parse_args()
-    
+
+    if args.repl:
+        run_repl()
+        sys.exit(0)
+
     if args.start > args.stop:
         print("Error: --start must be <= --stop")
         sys.exit(1)
-    
+
     run_full_pipeline(start_from_step=args.start, stop_at_step=args.stop)
 
@@ -3,11 +3,18 @@ Validation Script V3: Binary metrics with radius-based location validation
 """
 
 import pandas as pd
+import numpy as np
 import json
 import re
 import math
+from difflib import SequenceMatcher
 from pathlib import Path
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
 PROJECT_ROOT = Path(__file__).parent.parent
 MANUAL_CSV = PROJECT_ROOT / "output" / "manual_addresses_geocoded.csv"
 MANUAL_CSV_FALLBACK = PROJECT_ROOT / "output" / "manual_addresses_for_validation.csv"
@@ -36,6 +43,24 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return R * c
 
 
+def haversine_distance_vectorized(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance (miles) over whole coordinate arrays.
+
+    Same formula as haversine_distance but on NumPy arrays, so the trig
+    runs in compiled loops instead of one Python call per row; rows
+    with any missing coordinate come back NaN.
+    """
+    lat1 = np.radians(np.asarray(lat1, dtype=float))
+    lat2 = np.radians(np.asarray(lat2, dtype=float))
+    lon1 = np.radians(np.asarray(lon1, dtype=float))
+    lon2 = np.radians(np.asarray(lon2, dtype=float))
+
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * 3959 * np.arcsin(np.sqrt(a))
+
+
 def normalize_string(s):
     """Normalize string for comparison"""
     if pd.isna(s) or not s:
@@ -108,6 +133,29 @@ def extract_street_from_address(addr):
     return None
 
 
+# One shared matcher for the difflib fallback: constructing a fresh
+# SequenceMatcher rebuilds the b2j index every call, and autojunk=False
+# skips the O(n) junk heuristic on long inputs
+_seq_matcher = SequenceMatcher(autojunk=False)
+
+
+def string_similarity(a, b):
+    """Similarity of two strings on a 0-100 scale.
+
+    Uses rapidfuzz (compiled, bit-parallel Levenshtein) when installed;
+    difflib's SequenceMatcher is the pure-Python fallback. Put the side
+    repeated across calls in `b` — set_seq2 keeps its index cached while
+    b is unchanged.
+    """
+    if not a or not b:
+        return 0.0
+    if fuzz is not None:
+        return fuzz.ratio(a, b)
+    _seq_matcher.set_seq2(b)
+    _seq_matcher.set_seq1(a)
+    return _seq_matcher.ratio() * 100
+
+
 def check_town_match(pipeline_town, manual_city):
     """Binary: Does pipeline town match manual city? (1 or 0)"""
     if pd.isna(pipeline_town) or pd.isna(manual_city):
@@ -152,6 +200,12 @@ def check_street_match(scraped_streets_str, manual_street):
         if manual_base in street or street_base in manual_norm:
             return 1
 
+    # Fuzzy last resort: scraped streets carry OCR noise that exact and
+    # substring checks miss
+    for street in streets:
+        if string_similarity(street, manual_norm) >= 90:
+            return 1
+
     return 0
 
 
@@ -205,80 +259,66 @@ def main():
     # Validate
     print("\n2. Validating pipeline results...")
 
-    results = []
-
-    for idx, (_, manual_row) in enumerate(manual_df.iterrows()):
-        deed_id = str(manual_row['deed_id'])
-        ground_truth_address = manual_row['manual_address']
-        ground_truth_city = manual_row.get('city', '')
-        ground_truth_street = extract_street_from_address(ground_truth_address)
-
-        # Ground truth coordinates (if available)
-        ground_truth_lat = manual_row.get('ground_truth_latitude') if has_ground_truth_coords else None
-        ground_truth_lon = manual_row.get('ground_truth_longitude') if has_ground_truth_coords else None
-
-        # Find in pipeline by deed_id
-        pipeline_rows = pipeline_df[pipeline_df['deed_id'].astype(str) == deed_id]
-
-        if len(pipeline_rows) == 0:
-            results.append({
-                'deed_id': deed_id,
-                'ground_truth_address': ground_truth_address,
-                'ground_truth_city': ground_truth_city,
-                'ground_truth_street': ground_truth_street,
-                'pipeline_town': None,
-                'pipeline_streets': None,
-                'town_match': 0,
-                'street_match': 0,
-                'has_geolocation': 0,
-                'in_radius': 0,
-                'distance_miles': None,
-                'status': 'NOT_IN_PIPELINE'
-            })
-            continue
-
-        pipeline_row = pipeline_rows.iloc[0]
-
-        # Extract pipeline data
-        pipeline_town = pipeline_row.get('geo_town')
-        pipeline_streets = pipeline_row.get('scraped_streets')
-        cluster_lat = pipeline_row.get('geo_latitude')
-        cluster_lon = pipeline_row.get('geo_longitude')
-        cluster_radius = pipeline_row.get('geo_cluster_radius_miles')
-
-        # Calculate binary metrics
-        town_match = check_town_match(pipeline_town, ground_truth_city)
-        street_match = check_street_match(pipeline_streets, ground_truth_street)
-        has_geo = check_has_geolocation(cluster_lat, cluster_lon)
-        in_radius = check_in_radius(ground_truth_lat, ground_truth_lon,
-                                     cluster_lat, cluster_lon, cluster_radius)
-
-        # Calculate distance for reference
-        distance = haversine_distance(ground_truth_lat, ground_truth_lon, cluster_lat, cluster_lon)
-
-        # Format streets for display (first 3)
-        if isinstance(pipeline_streets, str):
-            streets_list = [s.strip() for s in str(pipeline_streets).split(';')[:3]]
-            streets_display = '; '.join(streets_list)
-        else:
-            streets_display = 'None'
-
-        results.append({
-            'deed_id': deed_id,
-            'ground_truth_address': ground_truth_address,
-            'ground_truth_city': ground_truth_city,
-            'ground_truth_street': ground_truth_street,
-            'pipeline_town': pipeline_town,
-            'pipeline_streets': streets_display,
-            'town_match': town_match,
-            'street_match': street_match,
-            'has_geolocation': has_geo,
-            'in_radius': in_radius,
-            'distance_miles': round(distance, 3) if distance else None,
-            'status': 'VALIDATED'
-        })
-
-    results_df = pd.DataFrame(results)
+    # One hash-join on deed_id instead of re-casting and full-scanning
+    # pipeline_df per manual row (O(N+M) rather than O(N*M))
+    manual_df['deed_id'] = manual_df['deed_id'].astype(str)
+    pipeline_df['deed_id'] = pipeline_df['deed_id'].astype(str)
+    pipe_cols = ['deed_id', 'geo_town', 'scraped_streets', 'geo_latitude',
+                 'geo_longitude', 'geo_cluster_radius_miles']
+    pipe = (pipeline_df[[c for c in pipe_cols if c in pipeline_df.columns]]
+            .drop_duplicates('deed_id'))
+    merged = manual_df.merge(pipe, on='deed_id', how='left', indicator=True)
+    validated_mask = merged['_merge'] == 'both'
+
+    if not has_ground_truth_coords:
+        merged['ground_truth_latitude'] = float('nan')
+        merged['ground_truth_longitude'] = float('nan')
+
+    # Distance for reference (and radius check below)
+    distances = pd.Series(
+        haversine_distance_vectorized(
+            merged['ground_truth_latitude'], merged['ground_truth_longitude'],
+            merged['geo_latitude'], merged['geo_longitude']),
+        index=merged.index)
+
+    # Binary metrics; the check functions already return 0 on the
+    # missing (NOT_IN_PIPELINE) side, and the pure-numeric ones are
+    # computed as vectorized boolean ops
+    lat, lon = merged['geo_latitude'], merged['geo_longitude']
+    has_geo = (lat.notna() & lon.notna()
+               & ~((lat.abs() < 0.001) & (lon.abs() < 0.001))).astype(int)
+    radius = merged['geo_cluster_radius_miles']
+    in_radius = (distances.notna() & radius.notna()
+                 & (distances <= radius)).astype(int)
+
+    def _streets_display(scraped):
+        if isinstance(scraped, str):
+            return '; '.join(s.strip() for s in scraped.split(';')[:3])
+        return 'None'
+
+    gt_streets = merged['manual_address'].map(extract_street_from_address)
+    gt_cities = (merged['city'] if 'city' in merged.columns
+                 else pd.Series([''] * len(merged), index=merged.index))
+
+    results_df = pd.DataFrame({
+        'deed_id': merged['deed_id'],
+        'ground_truth_address': merged['manual_address'],
+        'ground_truth_city': gt_cities,
+        'ground_truth_street': gt_streets,
+        'pipeline_town': merged['geo_town'],
+        'pipeline_streets': merged['scraped_streets'].map(_streets_display)
+                            .where(validated_mask, None),
+        'town_match': [check_town_match(t, c)
+                       for t, c in zip(merged['geo_town'], gt_cities)],
+        'street_match': [check_street_match(s, street)
+                         for s, street in zip(merged['scraped_streets'],
+                                              gt_streets)],
+        'has_geolocation': has_geo,
+        'in_radius': in_radius,
+        'distance_miles': distances.round(3),
+        'status': validated_mask.map(
+            {True: 'VALIDATED', False: 'NOT_IN_PIPELINE'}),
+    })
     validated_df = results_df[results_df['status'] == 'VALIDATED'].copy()
     not_in_pipeline = len(results_df[results_df['status'] == 'NOT_IN_PIPELINE'])
 
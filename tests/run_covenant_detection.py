@@ -10,21 +10,38 @@ Usage:
     python run_covenant_detection.py --limit 10  # Test with 10 deeds first
 """
 import argparse
+import json
 from pathlib import Path
 from tqdm import tqdm
 import logging
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Suppress verbose logging
 logging.getLogger('step2_ocr_extraction').setLevel(logging.WARNING)
 
-from deeds_pipeline.step2_ocr_extraction import (
-    detect_restrictive_covenant,
-    load_json,
-    save_json,
-    STEP2_OUTPUT
-)
+# Sentinel left by Step 2 when the model run was deferred
+_SKIP_SENTINEL = "Mistral model skipped for speed. Run separately later."
 
-def run_covenant_detection(input_file, output_file, limit=None):
+# The step2 import drags in torch/transformers (1-2s cold); defer it so
+# --help and unit-test collection don't pay for it
+def _import_step2():
+    from deeds_pipeline.step2_ocr_extraction import (
+        detect_restrictive_covenants_batch,
+        load_json,
+        save_json,
+    )
+    return detect_restrictive_covenants_batch, load_json, save_json
+
+def run_covenant_detection(input_file, output_file, limit=None, batch_size=8):
     """
     Add covenant detection to existing Step 2 results
 
@@ -32,6 +49,7 @@ def run_covenant_detection(input_file, output_file, limit=None):
         input_file: Path to Step 2 output JSON
         output_file: Path to save updated results
         limit: Optional limit for testing
+        batch_size: OCR texts per batched model forward pass
     """
     print("=" * 80)
     print("COVENANT DETECTION (MISTRAL-RRC MODEL)")
@@ -39,6 +57,8 @@ def run_covenant_detection(input_file, output_file, limit=None):
     print(f"\nInput:  {input_file}")
     print(f"Output: {output_file}")
 
+    detect_restrictive_covenants_batch, load_json, save_json = _import_step2()
+
     # Load data
     print("\n📂 Loading Step 2 data...")
     deed_data = load_json(input_file)
@@ -63,51 +83,61 @@ def run_covenant_detection(input_file, output_file, limit=None):
     print(f"\n🤖 Running Mistral-RRC covenant detection...")
     print("⚠️  This may take 1-2 minutes per deed on CPU")
 
-    with tqdm(total=len(deed_items), desc="Processing", unit="deed") as pbar:
-        for deed_id, deed_record in deed_items:
-            ocr_results = deed_record.get("ocr_results", [])
+    def flush_batch(batch):
+        """Run one batched forward pass and splice results back"""
+        if not batch:
+            return
+        refs = [ocr_result for _, ocr_result, _ in batch]
+        texts = [ocr_text for _, _, ocr_text in batch]
+        try:
+            covenant_results = detect_restrictive_covenants_batch(
+                texts, batch_size=batch_size)
+            for ocr_result, covenant_result in zip(refs, covenant_results):
+                ocr_result["covenant_detection"] = covenant_result
+                stats["processed"] += 1
+                if covenant_result.get("covenant_detected"):
+                    stats["covenants_detected"] += 1
+        except Exception as e:
+            for deed_id, ocr_result, _ in batch:
+                stats["errors"].append(f"Deed {deed_id}: {str(e)[:100]}")
+                ocr_result["covenant_detection"] = {
+                    "covenant_detected": False,
+                    "error": str(e)
+                }
 
-            if not ocr_results:
+    # One pre-scan splits work items from already-done records, so the
+    # hot loop only walks actual work and the progress bar total is
+    # accurate (images, not deeds)
+    to_process = []
+    for deed_id, deed_record in deed_items:
+        ocr_results = deed_record.get("ocr_results", [])
+        if not ocr_results:
+            stats["no_ocr_text"] += 1
+            continue
+        for ocr_result in ocr_results:
+            if ocr_result.get("covenant_detection", {}).get("note") != _SKIP_SENTINEL:
+                stats["already_done"] += 1
+                continue
+            ocr_text = ocr_result.get("ocr_text")
+            if not ocr_text:
                 stats["no_ocr_text"] += 1
-                pbar.update(1)
                 continue
+            to_process.append((deed_id, ocr_result, ocr_text))
 
-            for ocr_result in ocr_results:
-                # Skip if already processed
-                covenant_note = ocr_result.get("covenant_detection", {}).get("note")
-                if covenant_note != "Mistral model skipped for speed. Run separately later.":
-                    stats["already_done"] += 1
-                    continue
-
-                ocr_text = ocr_result.get("ocr_text")
-                if not ocr_text:
-                    stats["no_ocr_text"] += 1
-                    continue
-
-                try:
-                    # Run Mistral model
-                    covenant_result = detect_restrictive_covenant(ocr_text)
-
-                    # Update result
-                    ocr_result["covenant_detection"] = covenant_result
-
-                    stats["processed"] += 1
-                    if covenant_result.get("covenant_detected"):
-                        stats["covenants_detected"] += 1
-
-                except Exception as e:
-                    stats["errors"].append(f"Deed {deed_id}: {str(e)[:100]}")
-                    ocr_result["covenant_detection"] = {
-                        "covenant_detected": False,
-                        "error": str(e)
-                    }
-
-            pbar.update(1)
-            pbar.set_postfix({
-                "processed": stats["processed"],
-                "covenants": stats["covenants_detected"],
-                "errors": len(stats["errors"])
-            })
+    # Throttle postfix refreshes: re-formatting the stats dict every
+    # batch dominates the loop when most work is already done
+    with tqdm(total=len(to_process), desc="Processing", unit="image",
+              mininterval=0.5, miniters=50) as pbar:
+        for start in range(0, len(to_process), batch_size):
+            batch = to_process[start:start + batch_size]
+            flush_batch(batch)
+            pbar.update(len(batch))
+            if start % (batch_size * 8) == 0:
+                pbar.set_postfix({
+                    "processed": stats["processed"],
+                    "covenants": stats["covenants_detected"],
+                    "errors": len(stats["errors"])
+                }, refresh=False)
 
     # Save results
     print(f"\n💾 Saving results...")
@@ -138,13 +168,96 @@ def run_covenant_detection(input_file, output_file, limit=None):
     return deed_data
 
 
+def run_covenant_detection_streaming(input_file, output_file, batch_size=8):
+    """
+    O(1)-memory variant of run_covenant_detection
+
+    Streams (deed_id, deed_record) pairs off disk with ijson instead of
+    loading the whole Step 2 JSON, and appends each finished record to
+    a JSONL output as soon as its batch flushes — peak RSS stays flat
+    in the number of deeds and there is no single big serialize at the
+    end. Requires the optional ijson dependency.
+
+    Args:
+        input_file: Path to Step 2 output JSON
+        output_file: Path for the JSONL output (one {deed_id: record}
+            object per line)
+        batch_size: OCR texts per batched model forward pass
+    """
+    if ijson is None:
+        raise ImportError(
+            "ijson is required for streaming mode (pip install ijson)")
+
+    print("=" * 80)
+    print("COVENANT DETECTION (MISTRAL-RRC MODEL, STREAMING)")
+    print("=" * 80)
+    print(f"\nInput:  {input_file}")
+    print(f"Output: {output_file}")
+
+    detect_restrictive_covenants_batch, _, _ = _import_step2()
+
+    stats = {"total": 0, "processed": 0, "covenants_detected": 0,
+             "already_done": 0, "no_ocr_text": 0, "errors": []}
+
+    def dump_line(deed_id, deed_record):
+        payload = {deed_id: deed_record}
+        if orjson is not None:
+            return orjson.dumps(payload) + b"\n"
+        return (json.dumps(payload, ensure_ascii=False) + "\n").encode()
+
+    with open(input_file, 'rb') as in_f, open(output_file, 'wb') as out_f:
+        for deed_id, deed_record in tqdm(ijson.kvitems(in_f, ''),
+                                         desc="Processing", unit="deed"):
+            stats["total"] += 1
+            pending = []
+            for ocr_result in deed_record.get("ocr_results", []):
+                covenant_note = ocr_result.get(
+                    "covenant_detection", {}).get("note")
+                if covenant_note != _SKIP_SENTINEL:
+                    stats["already_done"] += 1
+                    continue
+                ocr_text = ocr_result.get("ocr_text")
+                if not ocr_text:
+                    stats["no_ocr_text"] += 1
+                    continue
+                pending.append((ocr_result, ocr_text))
+
+            # Batch within the deed so the record can be written (and
+            # dropped from memory) as soon as it completes
+            try:
+                covenant_results = detect_restrictive_covenants_batch(
+                    [t for _, t in pending], batch_size=batch_size) \
+                    if pending else []
+                for (ocr_result, _), covenant_result in zip(
+                        pending, covenant_results):
+                    ocr_result["covenant_detection"] = covenant_result
+                    stats["processed"] += 1
+                    if covenant_result.get("covenant_detected"):
+                        stats["covenants_detected"] += 1
+            except Exception as e:
+                for ocr_result, _ in pending:
+                    stats["errors"].append(f"Deed {deed_id}: {str(e)[:100]}")
+                    ocr_result["covenant_detection"] = {
+                        "covenant_detected": False,
+                        "error": str(e)
+                    }
+
+            out_f.write(dump_line(deed_id, deed_record))
+
+    print(f"\n✓ {stats['processed']} processed, "
+          f"{stats['covenants_detected']} covenants, "
+          f"{len(stats['errors'])} errors across {stats['total']} deeds")
+    print(f"✓ Output saved to: {output_file}")
+    return stats
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run covenant detection on Step 2 results")
     parser.add_argument(
         "--input",
         type=Path,
-        default=STEP2_OUTPUT,
-        help="Input file (Step 2 output)"
+        default=None,
+        help="Input file (defaults to the configured Step 2 output)"
     )
     parser.add_argument(
         "--output",
@@ -158,12 +271,34 @@ if __name__ == "__main__":
         default=None,
         help="Limit number of deeds to process (for testing)"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="OCR texts per batched model forward pass"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream input with ijson and write JSONL incrementally "
+             "(flat memory on large corpora)"
+    )
 
     args = parser.parse_args()
 
+    if args.input is None:
+        from deeds_pipeline.config import STEP2_OUTPUT
+        args.input = STEP2_OUTPUT
+
     # Default output file
     if args.output is None:
         input_path = Path(args.input)
         args.output = input_path.parent / f"{input_path.stem}_with_covenants{input_path.suffix}"
 
-    result = run_covenant_detection(args.input, args.output, args.limit)
+    if args.stream:
+        jsonl_output = args.output.with_suffix('.jsonl')
+        result = run_covenant_detection_streaming(
+            args.input, jsonl_output, batch_size=args.batch_size)
+    else:
+        result = run_covenant_detection(args.input, args.output, args.limit,
+                                        batch_size=args.batch_size)
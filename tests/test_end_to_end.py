@@ -73,7 +73,7 @@ def test_end_to_end():
         print("\n" + "-"*80)
         print("STEP 5: DATA INTEGRATION")
         print("-"*80)
-        final_records, final_df, quality_report = process_deeds_integration(deed_records=step4_results)
+        final_records, final_df, quality_report, _ = process_deeds_integration(deed_records=step4_results)
 
         if final_df is None or len(final_df) == 0:
             print("❌ Step 5 failed")